@@ -0,0 +1,68 @@
+"""Response assembly for ``detailed=true`` analyses: re-encoding vs spliced fragments.
+
+    python benchmarks/bench_report_response.py [--n 20000] [--people 2000]
+
+Both paths start from an analysis result and a warm report cache (people
+drawn from a fixed population, so signatures repeat). "encode" builds the
+report dict and renders it the way FastAPI does (jsonable_encoder +
+JSONResponse); "splice" encodes only the numbers and header and stitches in
+the cached report bytes. Prints p50/p99 per response and checks that both
+produce identical bytes.
+"""
+from __future__ import annotations
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from bench_normalize import FAMILY, GIVEN, MIDDLE
+from numerus import reporter
+from numerus.engine import AnalysisInput, analyze
+from numerus.rules import get_rules
+
+def encode(result, name, dob, system):
+    out = dict(result)
+    out["report"] = reporter.compose(result["numbers"], name, dob, system=system)
+    return JSONResponse(jsonable_encoder(out)).body
+
+def splice(result, name, dob, system):
+    report = reporter.compose_json(result["numbers"], name, dob, system=system)
+    return reporter.dumps_json(result)[:-1] + b',"report":' + report + b"}"
+
+def timings(fn, requests, system):
+    out = []
+    for result, name, dob in requests:
+        t = time.perf_counter()
+        fn(result, name, dob, system)
+        out.append((time.perf_counter() - t) * 1e6)
+    out.sort()
+    return out[len(out) // 2], out[int(len(out) * 0.99)]
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--people", type=int, default=2000)
+    ap.add_argument("--system", default="pythagorean")
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+    rules = get_rules(args.system)
+    people = []
+    for _ in range(args.people):
+        name = " ".join([rnd.choice(FAMILY), *rnd.sample(MIDDLE, rnd.randint(0, 2)), rnd.choice(GIVEN)])
+        dob = f"{rnd.randint(1950, 2010)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        people.append((analyze(AnalysisInput(name, dob, target_year=2025), rules), name, dob))
+    requests = [rnd.choice(people) for _ in range(args.n)]
+    assert all(encode(*r, rules.name) == splice(*r, rules.name) for r in people[:200])
+    for r in people:  # warm the report cache for both paths
+        splice(*r, rules.name)
+    old = timings(encode, requests, rules.name)
+    new = timings(splice, requests, rules.name)
+    print(f"{args.system}: {args.n} responses, {args.people} people, "
+          f"{reporter.REPORT_CACHE.stats()['entries']} report signatures")
+    print(f"encode : p50 {old[0]:7.1f} us   p99 {old[1]:7.1f} us")
+    print(f"splice : p50 {new[0]:7.1f} us   p99 {new[1]:7.1f} us   ({old[0] / new[0]:.1f}x at p50)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Name scoring throughput per script.
+
+    python benchmarks/bench_scripts.py [--n 20000]
+
+Each case scores a corpus of names in the system's own alphabet with
+``engine.name_profile``. Every script should score non-zero totals at a
+per-letter cost in the same ballpark as Pythagorean.
+"""
+from __future__ import annotations
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from numerus.engine import name_profile
+from numerus.rules import get_rules
+
+CASES = {
+    "pythagorean": ["Nguyen Van An", "Mary Jane Watson", "Tran Thi Thu Ha", "Yvonne O'Neil"],
+    "vietnamese_latin": ["Nguyễn Văn Đức", "Trần Thị Thu Hà", "Phạm Ngọc Thạch", "Lê Ánh Dương"],
+    "greek_isopsephy": ["Ἰωάννης Παπαδόπουλος", "Μαρία Νικολάου", "Γιώργος Οικονόμου"],
+    "hebrew_gematria": ["שָׁלוֹם כהן", "דוד לוי", "מרים אברהם", "יעקב פרץ"],
+    "arabic_abjad": ["محمد علي", "فاطمة الزهراء", "أحمد بن خالد", "عائشة إبراهيم"],
+}
+
+def corpus(words, n, rnd):
+    return [" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 3))) for _ in range(n)]
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000)
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+    print(f"{'system':<18}{'script':<8}{'us/name':>9}{'ns/letter':>11}{'zero totals':>13}")
+    for system, words in CASES.items():
+        rules = get_rules(system)
+        names = corpus(words, args.n, rnd)
+        name_profile(names[0], rules)  # warm up
+        t = time.perf_counter()
+        profiles = [name_profile(n, rules) for n in names]
+        elapsed = time.perf_counter() - t
+        letters = sum(len(p.letters) for p in profiles)
+        zeros = sum(p.total == 0 for p in profiles)
+        print(f"{system:<18}{rules.codec.script:<8}{elapsed / len(names) * 1e6:>9.2f}"
+              f"{elapsed / letters * 1e9:>11.0f}{zeros:>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Name scoring with and without the per-system token memo.
+
+    python benchmarks/bench_tokens.py [--n 50000] [--system pythagorean]
+
+Scores a generated Vietnamese full-name corpus (see bench_normalize.py)
+with ``engine.name_profile`` and reports the memo hit ratio.
+"""
+from __future__ import annotations
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_normalize import FAMILY, GIVEN, MIDDLE
+from numerus.engine import NameProfile, name_profile
+from numerus.rules import get_rules
+
+def unmemoized(full_name, rules):
+    letters, vowels, consonants, v, c, packed = rules.codec.score(full_name)
+    return NameProfile(letters, vowels, consonants, v, c, v + c, rules.codec.value_counts(packed, letters))
+
+def bench(fn, names, rules) -> float:
+    t = time.perf_counter()
+    for n in names:
+        fn(n, rules)
+    return (time.perf_counter() - t) / len(names) * 1e6
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50000)
+    ap.add_argument("--system", default="pythagorean")
+    args = ap.parse_args(argv)
+    rnd = random.Random(0)
+    names = [" ".join([rnd.choice(FAMILY), *rnd.sample(MIDDLE, rnd.randint(0, 2)), rnd.choice(GIVEN)])
+             for _ in range(args.n)]
+    rules = get_rules(args.system)
+    assert all(name_profile(n, rules) == unmemoized(n, rules) for n in names[:1000])
+    rules.codec.token.cache_clear()
+    old = bench(unmemoized, names, rules)
+    new = bench(name_profile, names, rules)
+    stats = rules.codec.token_stats()
+    print(f"{args.system}: {len(names)} names")
+    print(f"whole-name scoring : {old:6.2f} us/name")
+    print(f"token memo         : {new:6.2f} us/name   ({old / new:.1f}x)")
+    print(f"memo: {stats['entries']} tokens, hit rate {stats['hit_rate_percent']}%")
+
+if __name__ == "__main__":
+    main()
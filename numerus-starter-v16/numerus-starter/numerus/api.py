@@ -1,14 +1,15 @@
 from __future__ import annotations
 from fastapi import FastAPI, HTTPException, APIRouter, Request, Depends, Header
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 import os
 import jwt
 import json
 import datetime
 import time
+import itertools
 import calendar
 import requests
 import logging
@@ -24,8 +25,15 @@ from starlette.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
-from .rules import SystemRules
-from .engine import analyze, AnalysisInput
+from .rules import RULES, SystemRules, get_rules
+from .engine import (DISCLAIMER, analyze_multi, analyze_result, available_fields, canonical_name,
+                     AnalysisInput, AnalysisResult)
+from .cache import ResultCache, next_year_rollover
+from . import dateindex as _dateindex
+from . import namesearch as _namesearch
+from . import planner as _planner
+from . import variants as _variants
+from . import timeline as _timeline
 
 # Global metrics
 _METRICS = {
@@ -194,7 +202,7 @@ def _rate_key(request: StarletteRequest, api_key: str | None):
 # Rate Limit Middleware
 class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: StarletteRequest, call_next):
-        if request.url.path not in ["/v1/analyze", "/v1/export", "/v1/analyze/batch"]:
+        if request.url.path not in ["/v1/analyze", "/v1/export", "/v1/analyze/batch", "/v1/analyze/multi", "/v1/timeline", "/v1/calendar", "/v1/dates/search", "/v1/names/search", "/v1/names/variants"]:
             return await call_next(request)
         limit = int(os.getenv("RATE_LIMIT_PER_MIN", "60"))
         api_key = request.headers.get("X-API-Key")
@@ -323,11 +331,111 @@ class AnalyzeRequest(BaseModel):
     locale: Optional[str] = Field(default="vi", description="Narrative locale: vi|en")
     role: Optional[str] = Field(default=None, description="User role, e.g., product_manager, researcher, teacher")
     depth: Optional[str] = Field(default="standard", description="Narrative depth: basic|standard|expert|expert_max")
+    fields: Optional[List[str]] = Field(default=None, description="Only compute these numbers (see /v1/fields); default all")
+
+class MultiAnalyzeRequest(BaseModel):
+    full_name: str = Field(..., description="Full name to analyze")
+    date_of_birth: str = Field(..., description="YYYY-MM-DD")
+    gender: Optional[str] = Field(default=None, description="Optional gender (echoed only)")
+    systems: List[str] = Field(..., min_length=1, max_length=20, description="Systems to compare, e.g. pythagorean, chaldean, vietnamese_latin")
+    target_year: Optional[int] = Field(default=None, description="For personal year calculations")
+    fields: Optional[List[str]] = Field(default=None, description="Only compute these numbers (see /v1/fields); default all")
+
+    def for_system(self, system: str) -> AnalyzeRequest:
+        return AnalyzeRequest(full_name=self.full_name, date_of_birth=self.date_of_birth, gender=self.gender,
+                              system=system, target_year=self.target_year, detailed=False, fields=self.fields)
+
+class DateSearchRequest(BaseModel):
+    system: str = Field(default="pythagorean", description="Numerology system")
+    criteria: Dict[str, int] = Field(default_factory=dict, description="DOB numbers that must all match, e.g. {\"life_path\": 8, \"pinnacle_1\": 11}")
+    start: str = Field(..., description="YYYY-MM-DD, inclusive")
+    end: str = Field(..., description="YYYY-MM-DD, inclusive")
+    limit: int = Field(default=100, ge=1, le=1000, description="Dates per page")
+    offset: int = Field(default=0, ge=0, description="Dates to skip")
+
+class NameSearchRequest(BaseModel):
+    system: str = Field(default="pythagorean", description="Numerology system")
+    family: List[str] = Field(..., min_length=1, description="Candidate family names, most preferred first")
+    middle: List[str] = Field(default_factory=lambda: [""], description="Candidate middle names; \"\" means no middle name")
+    given: List[str] = Field(..., min_length=1, description="Candidate given names, most preferred first")
+    order: str = Field(default="family_first", description="family_first (Nguyen Van An) or given_first (An Van Nguyen)")
+    targets: Dict[str, int] = Field(..., min_length=1, description="Wanted numbers: expression, soul_urge, personality")
+    limit: int = Field(default=50, ge=1, le=1000, description="Results per page")
+    offset: int = Field(default=0, ge=0, description="Results to skip")
+
+    def slots(self) -> List[List[str]]:
+        if self.order == "family_first":
+            return [self.family, self.middle or [""], self.given]
+        if self.order == "given_first":
+            return [self.given, self.middle or [""], self.family]
+        raise ValueError("order must be family_first or given_first")
+
+class NameVariantsRequest(BaseModel):
+    full_name: str = Field(..., description="Full name as usually written")
+    alternates: Dict[str, List[str]] = Field(default_factory=dict, description="Per name part, other spellings or nicknames; \"\" drops the part")
+    date_of_birth: Optional[str] = Field(default=None, description="YYYY-MM-DD; adds maturity per variant")
+    system: str = Field(default="pythagorean", description="Numerology system")
 
 class BatchAnalyzeRequest(BaseModel):
     requests: List[AnalyzeRequest] = Field(..., description="List of analyze requests")
     parallel: bool = Field(default=False, description="Process in parallel")
 
+# In-process result cache in front of engine.analyze (per worker)
+_RESULT_CACHE = ResultCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "10000")),
+    max_bytes=int(os.getenv("RESULT_CACHE_MB", "64")) * 1024 * 1024,
+)
+
+def _result_key(req: AnalyzeRequest, rules: SystemRules) -> tuple:
+    fields = tuple(req.fields) if req.fields is not None else None
+    # rules.revision changes on hot reload, so edited systems never serve stale results
+    return (canonical_name(req.full_name, rules, req.trace), req.date_of_birth, req.system, rules.revision,
+            req.target_year, req.trace, fields)
+
+def _analyze_cached(req: AnalyzeRequest, rules: SystemRules, key: tuple | None = None) -> AnalysisResult:
+    # Compact results are cached; routes expand them with _with_input()
+    key = key or _result_key(req, rules)
+    result = _RESULT_CACHE.get(key)
+    if result is None:
+        result = analyze_result(
+            AnalysisInput(
+                full_name=req.full_name,
+                date_of_birth=req.date_of_birth,
+                gender=req.gender,
+                system=req.system,
+                target_year=req.target_year,
+                fields=req.fields,
+            ),
+            rules=rules,
+            trace=req.trace
+        )
+        _RESULT_CACHE.put(key, result, expires_at=_expires_at(req))
+    return result
+
+def _expires_at(req: AnalyzeRequest) -> float | None:
+    # Without an explicit target_year, personal_year goes stale at New Year
+    return None if req.target_year else next_year_rollover()
+
+def _analyze_multi_cached(reqs: List[AnalyzeRequest], rules_list: List[SystemRules]) -> List[AnalysisResult]:
+    # Per-system cache entries are shared with /v1/analyze; misses are computed together
+    keys = [_result_key(r, rules) for r, rules in zip(reqs, rules_list)]
+    results = [_RESULT_CACHE.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        first = reqs[missing[0]]
+        inp = AnalysisInput(full_name=first.full_name, date_of_birth=first.date_of_birth, gender=first.gender,
+                            target_year=first.target_year, fields=first.fields)
+        for i, result in zip(missing, analyze_multi(inp, [rules_list[i] for i in missing])):
+            results[i] = result
+            _RESULT_CACHE.put(keys[i], result, expires_at=_expires_at(reqs[i]))
+    return results
+
+def _with_input(result: AnalysisResult, req: AnalyzeRequest) -> dict:
+    # Fresh JSON shape per request: echo this caller's input, and let routes add keys (e.g. "report")
+    result = result.to_dict()
+    result["input"] = {"full_name": req.full_name, "date_of_birth": req.date_of_birth, "gender": req.gender}
+    return result
+
 # FastAPI app and router
 app = FastAPI(title="Numerus API", version="1.0.0")
 router = APIRouter(prefix="/v1")
@@ -359,22 +467,12 @@ def post_analyze(req: AnalyzeRequest, request: Request, _: bool = Depends(requir
         raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
     
     try:
-        rules = SystemRules.load(req.system)
+        rules = get_rules(req.system)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        result = analyze(
-            AnalysisInput(
-                full_name=req.full_name,
-                date_of_birth=req.date_of_birth,
-                gender=req.gender,
-                system=req.system,
-                target_year=req.target_year,
-            ),
-            rules=rules,
-            trace=req.trace
-        )
+        result = _with_input(_analyze_cached(req, rules), req)
         
         # Track system usage in metrics
         if req.system in _METRICS["systems_used"]:
@@ -382,11 +480,13 @@ def post_analyze(req: AnalyzeRequest, request: Request, _: bool = Depends(requir
         else:
             _METRICS["systems_used"][req.system] = 1
         
-        # Compose narrative if requested
+        # Compose narrative if requested; the report arrives pre-encoded (cached
+        # fragments plus this request's header) and is spliced into the body
+        from . import reporter
+        report = None
         if req.detailed:
             try:
-                from . import reporter
-                result["report"] = reporter.compose(
+                report = reporter.compose_json(
                     numerics=result.get("numbers", {}),
                     full_name=req.full_name,
                     date_of_birth=req.date_of_birth,
@@ -401,7 +501,10 @@ def post_analyze(req: AnalyzeRequest, request: Request, _: bool = Depends(requir
         # Audit event
         audit_event("analyze", req.full_name, req.date_of_birth, req.system, True)
         
-        return result
+        body = reporter.dumps_json(result)
+        if report is not None:
+            body = body[:-1] + b',"report":' + report + b"}"
+        return Response(content=body, media_type="application/json")
     except ValueError as ve:
         audit_event("analyze", req.full_name, req.date_of_birth, req.system, False, {"error": str(ve)})
         raise HTTPException(status_code=400, detail=str(ve))
@@ -409,6 +512,116 @@ def post_analyze(req: AnalyzeRequest, request: Request, _: bool = Depends(requir
         audit_event("analyze", req.full_name, req.date_of_birth, req.system, False, {"error": "internal"})
         raise HTTPException(status_code=500, detail="Internal error")
 
+@router.post("/analyze/multi")
+def post_analyze_multi(req: MultiAnalyzeRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+
+    systems = list(dict.fromkeys(req.systems))
+    try:
+        rules_list = [get_rules(system) for system in systems]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        results = _analyze_multi_cached([req.for_system(system) for system in systems], rules_list)
+        for system in systems:
+            _METRICS["systems_used"][system] = _METRICS["systems_used"].get(system, 0) + 1
+        audit_event("analyze_multi", req.full_name, req.date_of_birth, ",".join(systems), True)
+
+        # Compact comparison: one value per system, in "systems" order
+        numbers = [result.numbers() for result in results]
+        fields = results[0].fields
+        return {
+            "input": {"full_name": req.full_name, "date_of_birth": req.date_of_birth, "gender": req.gender},
+            "systems": [{"id": system, "name": rules.name} for system, rules in zip(systems, rules_list)],
+            "numbers": {f: [n[f] for n in numbers] for f in fields},
+            "same_in_all": [f for f in fields if all(n[f] == numbers[0][f] for n in numbers[1:])],
+            "disclaimer": DISCLAIMER,
+        }
+    except ValueError as ve:
+        audit_event("analyze_multi", req.full_name, req.date_of_birth, ",".join(systems), False, {"error": str(ve)})
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        audit_event("analyze_multi", req.full_name, req.date_of_birth, ",".join(systems), False, {"error": "internal"})
+        raise HTTPException(status_code=500, detail="Internal error")
+
+@router.get("/timeline")
+def get_timeline(date_of_birth: str, request: Request, system: str = "pythagorean",
+                 _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    """Ages 0-100 in one response: personal year, active pinnacle and challenge per age."""
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+    try:
+        rules = get_rules(system)
+        return _timeline.timeline(date_of_birth, rules)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+@router.get("/calendar")
+def get_calendar(date_of_birth: str, request: Request, system: str = "pythagorean",
+                 year: int | None = None, start: str | None = None, end: str | None = None,
+                 format: str = "ndjson",
+                 _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    """Personal year/month/day for every day of a year (default: this year) or of start..end, streamed."""
+    if format not in ("ndjson", "ics"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or ics")
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+    try:
+        rules = get_rules(system)
+        if year is None:
+            year = datetime.date.today().year
+        first, last = _planner.date_range(start or f"{year:04d}-01-01", end or f"{year:04d}-12-31")
+        blocks = _planner.iter_months(date_of_birth, rules, first, last)
+        head = next(blocks)  # validates date_of_birth before the response starts
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    blocks = itertools.chain((head,), blocks)
+    if format == "ics":
+        return StreamingResponse(_planner.ics(blocks, date_of_birth, rules), media_type="text/calendar; charset=utf-8",
+                                 headers={"Content-Disposition": f'attachment; filename="personal-days-{first:%Y%m%d}-{last:%Y%m%d}.ics"'})
+    return StreamingResponse(_planner.ndjson(blocks), media_type="application/x-ndjson")
+
+@router.post("/dates/search")
+def post_dates_search(req: DateSearchRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    """Dates in a range whose life path, birthday, pinnacles and challenges match every criterion."""
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+    try:
+        rules = get_rules(req.system)
+        return _dateindex.find_dates(rules, req.criteria, req.start, req.end, req.limit, req.offset)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+@router.post("/names/search")
+def post_names_search(req: NameSearchRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    """Name combinations whose expression / soul urge / personality hit the targets, ranked by preference."""
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+    try:
+        rules = get_rules(req.system)
+        return _namesearch.search_names(rules, req.slots(), req.targets, req.limit, req.offset)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+@router.post("/names/variants")
+def post_names_variants(req: NameVariantsRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
+    """Name numbers for every variant of one name (dropped parts, nicknames, alternate spellings)."""
+    tenant = _tenant_from_key(request.headers.get('X-API-Key'))
+    if not _quota_check_and_decr(tenant):
+        raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
+    try:
+        rules = get_rules(req.system)
+        return _variants.name_variants(req.full_name, req.alternates, rules, req.date_of_birth)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
 @router.get("/health")
 def get_health():
     return {"status": "ok"}
@@ -416,6 +629,7 @@ def get_health():
 @router.get("/metrics")
 def get_metrics():
     """Get application metrics for monitoring"""
+    from . import reporter
     uptime = time.time() - _METRICS["start_time"]
     
     # Calculate response time stats
@@ -443,6 +657,12 @@ def get_metrics():
             "samples": len(response_times)
         },
         "systems_used": _METRICS["systems_used"],
+        "result_cache": _RESULT_CACHE.stats(),
+        "rules": RULES.stats(),
+        "timeline_cache": _timeline.cache_stats(),
+        "context_rules": reporter.CONTEXT_RULES.stats(),
+        "report_cache": reporter.REPORT_CACHE.stats(),
+        "token_memo": {system: rules.codec.token_stats() for system, rules in RULES.loaded().items()},
         "memory_info": {
             "response_times_cached": len(response_times)
         }
@@ -450,15 +670,18 @@ def get_metrics():
 
 @router.get("/systems")
 def get_systems():
-    from .rules import DATA_DIR
     systems = []
-    for fn in os.listdir(DATA_DIR):
-        if fn.endswith(".json"):
-            with open(os.path.join(DATA_DIR, fn), "r", encoding="utf-8") as f:
-                data = json.load(f)
-                systems.append({"id": fn.replace(".json",""), "name": data.get("name")})
+    for system in RULES.systems():
+        try:
+            systems.append({"id": system, "name": get_rules(system).name})
+        except Exception:
+            continue
     return {"systems": systems}
 
+@router.get("/fields")
+def get_fields():
+    return {"fields": available_fields()}
+
 @router.post("/export", response_class=HTMLResponse)
 def post_export(req: AnalyzeRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
     tenant = _tenant_from_key(request.headers.get('X-API-Key'))
@@ -466,22 +689,12 @@ def post_export(req: AnalyzeRequest, request: Request, _: bool = Depends(require
         raise HTTPException(status_code=402, detail="Quota exceeded for tenant")
     
     try:
-        rules = SystemRules.load(req.system)
+        rules = get_rules(req.system)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        result = analyze(
-            AnalysisInput(
-                full_name=req.full_name,
-                date_of_birth=req.date_of_birth,
-                gender=req.gender,
-                system=req.system,
-                target_year=req.target_year,
-            ),
-            rules=rules,
-            trace=req.trace
-        )
+        result = _with_input(_analyze_cached(req, rules), req)
         
         # Generate simple HTML report
         html_content = f"""
@@ -522,30 +735,36 @@ def get_examples():
 def post_batch_analyze(req: BatchAnalyzeRequest, request: Request, _: bool = Depends(require_api_key), __: dict | None = Depends(require_jwt)):
     tenant = _tenant_from_key(request.headers.get('X-API-Key'))
     
-    results = []
+    results = []  # (compact result, request) or (error dict, None)
+    seen = {}  # canonical key -> result, so duplicates in one batch are computed once
     for analyze_req in req.requests:
         if not _quota_check_and_decr(tenant):
-            results.append({"error": "Quota exceeded for tenant"})
+            results.append(({"error": "Quota exceeded for tenant"}, None))
             continue
         
         try:
-            rules = SystemRules.load(analyze_req.system)
-            result = analyze(
-                AnalysisInput(
-                    full_name=analyze_req.full_name,
-                    date_of_birth=analyze_req.date_of_birth,
-                    gender=analyze_req.gender,
-                    system=analyze_req.system,
-                    target_year=analyze_req.target_year,
-                ),
-                rules=rules,
-                trace=analyze_req.trace
-            )
-            results.append(result)
+            rules = get_rules(analyze_req.system)
+            key = _result_key(analyze_req, rules)
+            if key not in seen:
+                seen[key] = _analyze_cached(analyze_req, rules, key)
+            results.append((seen[key], analyze_req))
         except Exception as e:
-            results.append({"error": str(e)})
+            results.append(({"error": str(e)}, None))
+    
+    def body():
+        # Expand one result at a time while writing; only compact results stay resident
+        yield b'{"results":['
+        for i, (result, analyze_req) in enumerate(results):
+            # The 200 is already sent: a failing item becomes an error item, never a cut-off body
+            try:
+                item = _with_input(result, analyze_req) if analyze_req is not None else result
+                chunk = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+            except Exception as e:
+                chunk = json.dumps({"error": str(e)}, ensure_ascii=False, separators=(",", ":"))
+            yield (b"," if i else b"") + chunk.encode("utf-8")
+        yield b"]}"
     
-    return {"results": results}
+    return StreamingResponse(body(), media_type="application/json")
 
 # Admin endpoints
 @router.get("/admin/quota/{tenant}")
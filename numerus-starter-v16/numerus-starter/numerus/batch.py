@@ -0,0 +1,166 @@
+from __future__ import annotations
+import datetime
+from functools import lru_cache
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .engine import date_parts
+from .reduction import Reducer
+from .rules import SystemRules, get_rules, normalize_name
+
+# Columnar counterpart of engine.analyze() for large cohorts: every metric is
+# computed with NumPy array operations over the whole batch at once.
+
+_SEP = "\x00"  # record separator inside the joined name blob (never a scored letter)
+
+def _digit_sum(x: np.ndarray) -> np.ndarray:
+    if (x < 0).any():
+        raise ValueError("digit sums need non-negative values")
+    x = x.copy()
+    s = np.zeros_like(x)
+    while x.any():
+        s += x % 10
+        x //= 10
+    return s
+
+@lru_cache(maxsize=None)
+def _lut(reducer: Reducer) -> np.ndarray:
+    return np.fromiter((reducer(i) for i in range(reducer.bound)), dtype=np.int64, count=reducer.bound)
+
+def _reduce(x: np.ndarray, reducer: Reducer) -> np.ndarray:
+    x = np.asarray(x, dtype=np.int64)
+    big = x >= reducer.bound
+    if big.any():
+        x = x.copy()
+        if reducer.policy[0] == "classic":
+            while big.any():
+                x[big] = _digit_sum(x[big])
+                big = x >= reducer.bound
+        else:
+            x[big] = 1 + (x[big] - 1) % 9
+    return _lut(reducer)[x]
+
+_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9]  # positions of the digits in YYYY-MM-DD
+
+def _strict_iso(a: np.ndarray) -> bool:
+    # Every entry exactly YYYY-MM-DD (NumPy alone also takes "", "NaT", "2000", "2000-01T12", ...)
+    if a.dtype != np.dtype("<U10") or not len(a):
+        return False
+    ch = a.view(np.uint32).reshape(len(a), 10)
+    digits = ch[:, _DIGITS]
+    if not (((digits >= 48) & (digits <= 57)).all() and (ch[:, [4, 7]] == 45).all()):
+        return False
+    return bool((ch[:, :4] != 48).any(axis=1).all())  # year 0000: datetime.date has no year 0
+
+def _parse_dates(dobs: Sequence[str]):
+    a = np.asarray(dobs, dtype=str)
+    days = None
+    if _strict_iso(a):
+        try:
+            days = a.astype("datetime64[D]")
+        except ValueError:
+            pass
+    if days is None:
+        # Same rule as analyze(): date_parts + datetime.date (also takes e.g. 1990-1-5)
+        try:
+            days = np.array([datetime.date(*date_parts(s)) for s in dobs], dtype="datetime64[D]")
+        except Exception:
+            raise ValueError("date_of_birth must be YYYY-MM-DD and valid")
+    months = days.astype("datetime64[M]")
+    y = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    m = months.astype(np.int64) % 12 + 1
+    d = (days - months).astype(np.int64) + 1
+    return y, m, d
+
+def _encode_names(names: Sequence[str], rules: SystemRules):
+    # One normalize/uppercase/translate pass over the whole batch; returns the
+    # letter code points and the record index each letter belongs to.
+    codec = rules.codec
+    text = _SEP.join(names)
+    if text.count(_SEP) != len(names) - 1:
+        text = _SEP.join(n.replace(_SEP, "") for n in names)
+    keep = type(codec.keep)(codec.keep)  # same delete-unmapped table, plus the separator
+    keep[ord(_SEP)] = _SEP
+    blob = normalize_name(text, codec.normalization).upper().translate(keep)
+    codes = np.frombuffer(blob.encode("utf-32-le"), dtype=np.uint32)
+    sep = codes == ord(_SEP)
+    record = np.cumsum(sep)[~sep]
+    return codes[~sep], record
+
+def _letter_tables(rules: SystemRules):
+    codec = rules.codec
+    size = max(codec.keep, default=0) + 1
+    value = np.zeros(size, dtype=np.int64)
+    vowel = np.zeros(size, dtype=bool)
+    for o, v in codec.values.items():
+        value[o] = ord(v)
+    for o, ch in codec.vowels.items():
+        vowel[o] = ch is not None
+    return value, vowel
+
+def analyze_batch(names: Sequence[str], dobs: Sequence[str], system: str | SystemRules = "pythagorean",
+                  target_year: int | Sequence[int] | None = None) -> Dict[str, np.ndarray]:
+    """Analyze parallel columns of names and ISO dates of birth.
+
+    Returns a dict of arrays with one row per record: scalar metrics are 1-D,
+    ``pinnacles``/``challenges``/``transition_ages`` are (n, 4), ``lo_shu``
+    is (n, 9) digit counts for 1..9 and ``karmic_lessons`` is an (n, 9)
+    boolean mask of the missing values 1..9.
+    """
+    rules = get_rules(system) if isinstance(system, str) else system
+    if len(names) != len(dobs):
+        raise ValueError("names and dobs must have the same length")
+    n = len(names)
+    red = rules.reducer
+    R = lambda x: _reduce(x, red)
+
+    # ---- DOB half ----
+    y, m, d = _parse_dates(dobs)
+    md = _digit_sum(m) + _digit_sum(d)
+    lp = R(_digit_sum(y) + md)
+    bd = R(d)
+    rm, rd, ry = R(m), R(d), R(y)
+    p1 = R(rm + rd)
+    p2 = R(rd + ry)
+    p3 = R(p1 + p2)
+    p4 = R(rm + ry)
+    c1 = np.abs(rm - rd)
+    c2 = np.abs(rd - ry)
+    c3 = np.abs(c1 - c2)
+    c4 = np.abs(rm - ry)
+    first = 36 - lp
+    if target_year is None:
+        target_year = datetime.date.today().year
+    py = R(_digit_sum(np.broadcast_to(np.asarray(target_year, dtype=np.int64), (n,))) + md)
+    digits = np.stack([y // 1000 % 10, y // 100 % 10, y // 10 % 10, y % 10,
+                       m // 10, m % 10, d // 10, d % 10], axis=1)
+    lo_shu = np.stack([(digits == k).sum(axis=1) for k in range(1, 10)], axis=1)
+
+    # ---- name half ----
+    codes, record = _encode_names(names, rules)
+    value_of, is_vowel = _letter_tables(rules)
+    vals = value_of[codes]
+    vmask = is_vowel[codes]
+    total = np.bincount(record, weights=vals, minlength=n).astype(np.int64)
+    vsum = np.bincount(record[vmask], weights=vals[vmask], minlength=n).astype(np.int64)
+    csum = total - vsum
+    present = np.zeros((n, 10), dtype=bool)
+    small = vals < 10
+    present[record[small], vals[small]] = True
+    ex = R(total)
+
+    return {
+        "life_path": lp,
+        "birthday": bd,
+        "expression": ex,
+        "soul_urge": R(vsum),
+        "personality": R(csum),
+        "maturity": R(lp + ex),
+        "pinnacles": np.stack([p1, p2, p3, p4], axis=1),
+        "challenges": np.stack([R(c1), R(c2), R(c3), R(c4)], axis=1),
+        "transition_ages": np.stack([first, first + 9, first + 18, first + 27], axis=1),
+        "personal_year": py,
+        "lo_shu": lo_shu,
+        "karmic_lessons": ~present[:, 1:],
+    }
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import datetime, sys, threading, time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+def approx_size(obj: Any) -> int:
+    # Rough deep size of JSON-like data (dicts, lists, tuples, str, int) and slotted objects
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k) + approx_size(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            size += approx_size(v)
+    elif hasattr(type(obj), "__slots__"):
+        for name in type(obj).__slots__:
+            size += approx_size(getattr(obj, name, None))
+    return size
+
+def next_year_rollover(now: Optional[float] = None) -> float:
+    # Epoch seconds of the next local Jan 1st 00:00 (when "current year" results go stale)
+    today = datetime.date.fromtimestamp(now if now is not None else time.time())
+    return time.mktime(datetime.date(today.year + 1, 1, 1).timetuple())
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by entry count and approximate bytes.
+
+    Entries may carry an absolute expiry (epoch seconds). Counters for
+    hits, misses, evictions and expirations are exposed via ``stats()``.
+    """
+
+    def __init__(self, maxsize: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = approx_size):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = item
+            if expires_at is not None and time.time() >= expires_at:
+                del self._data[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            while len(self._data) > self.maxsize or self._bytes > self.max_bytes:
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.maxsize,
+            "approx_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate_percent": round(self.hits / lookups * 100, 2) if lookups else 0,
+        }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+import calendar, datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .datetable import FIRST_YEAR, LAST_YEAR, RECORD_SIZE, _HEADER, date_table
+from .engine import _digit_sum, date_parts
+from .reduction import Reducer
+from .rules import SystemRules
+
+# Reverse lookups ("every date in 2027 with life path 8 and first pinnacle
+# 11"): for each DOB-derived number, each value maps to the sorted ordinals of
+# the dates producing it. A query bisects every posting list down to the
+# range and intersects them smallest first, so it never visits dates that
+# cannot match. Built once per reduction policy over the date-table years,
+# from the memory-mapped table when one exists.
+
+FIELDS = ("life_path", "birthday",
+          "pinnacle_1", "pinnacle_2", "pinnacle_3", "pinnacle_4",
+          "challenge_1", "challenge_2", "challenge_3", "challenge_4")
+_RECORD_OFFSET = 5  # life_path's byte in a date-table record; FIELDS follow in order
+
+class DateIndex:
+    __slots__ = ("first", "last", "_postings")
+
+    def __init__(self, first: int, columns: Mapping[str, bytes]):
+        self.first = first
+        self.last = first + len(columns[FIELDS[0]]) - 1
+        self._postings: Dict[str, Dict[int, array]] = {}
+        for field, col in columns.items():
+            post: Dict[int, array] = {}
+            for o, v in enumerate(col, first):
+                p = post.get(v)
+                if p is None:
+                    p = post[v] = array("i")
+                p.append(o)
+            self._postings[field] = post
+
+    def values(self, field: str) -> List[int]:
+        return sorted(self._postings[field])
+
+    def query(self, criteria: Mapping[str, int], lo: int, hi: int) -> List[int]:
+        """Sorted ordinals in lo..hi (inclusive) matching every field == value."""
+        spans = []
+        for field, value in criteria.items():
+            post = self._postings[field].get(value)
+            if post is None:
+                return []
+            spans.append(post[bisect_left(post, lo):bisect_right(post, hi)])
+        if not spans:
+            return list(range(max(lo, self.first), min(hi, self.last) + 1))
+        spans.sort(key=len)
+        hits = spans[0]
+        if len(spans) == 1:
+            return hits.tolist()
+        found = set(hits)
+        for span in spans[1:]:
+            found = found.intersection(span)
+            if not found:
+                return []
+        return sorted(found)
+
+def _columns_from_table(reducer: Reducer) -> Optional[Tuple[int, Dict[str, bytes]]]:
+    table = date_table(reducer)
+    first = datetime.date(FIRST_YEAR, 1, 1).toordinal()
+    if table is None or table.first > first or table.first + table.count <= datetime.date(LAST_YEAR, 12, 31).toordinal():
+        return None
+    start = _HEADER.size + (first - table.first) * RECORD_SIZE
+    stop = _HEADER.size + (datetime.date(LAST_YEAR, 12, 31).toordinal() - table.first + 1) * RECORD_SIZE
+    buf = table._buf
+    return first, {f: buf[start + _RECORD_OFFSET + i:stop:RECORD_SIZE] for i, f in enumerate(FIELDS)}
+
+def _computed_columns(reducer: Reducer) -> Tuple[int, Dict[str, bytes]]:
+    # Same arithmetic as engine.compute_date_profile, with per-year/month/day parts hoisted
+    cols = {f: bytearray() for f in FIELDS}
+    lp, bd, p1, p2, p3, p4, c1, c2, c3, c4 = (cols[f] for f in FIELDS)
+    for y in range(FIRST_YEAR, LAST_YEAR + 1):
+        ry, ys = reducer(y), _digit_sum(y)
+        for m in range(1, 13):
+            rm, ms = reducer(m), _digit_sum(m)
+            for d in range(1, calendar.monthrange(y, m)[1] + 1):
+                rd = reducer(d)
+                a, b = reducer(rm + rd), reducer(rd + ry)
+                x, z = abs(rm - rd), abs(rd - ry)
+                lp.append(reducer(ys + ms + _digit_sum(d)))
+                bd.append(rd)
+                p1.append(a); p2.append(b); p3.append(reducer(a + b)); p4.append(reducer(rm + ry))
+                c1.append(reducer(x)); c2.append(reducer(z)); c3.append(reducer(abs(x - z))); c4.append(reducer(abs(rm - ry)))
+    return datetime.date(FIRST_YEAR, 1, 1).toordinal(), {f: bytes(c) for f, c in cols.items()}
+
+@lru_cache(maxsize=None)
+def date_index(reducer: Reducer) -> DateIndex:
+    """Index for one reduction policy, covering FIRST_YEAR..LAST_YEAR."""
+    first, columns = _columns_from_table(reducer) or _computed_columns(reducer)
+    return DateIndex(first, columns)
+
+def find_dates(rules: SystemRules, criteria: Mapping[str, int], start: str, end: str,
+               limit: int = 100, offset: int = 0) -> Dict:
+    """Dates in start..end whose DOB numbers equal every criterion, paginated in date order."""
+    unknown = sorted(set(criteria) - set(FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    try:
+        lo = datetime.date(*date_parts(start)).toordinal()
+        hi = datetime.date(*date_parts(end)).toordinal()
+    except Exception:
+        raise ValueError("start and end must be YYYY-MM-DD and valid")
+    if hi < lo:
+        raise ValueError("end must not be before start")
+    index = date_index(rules.reducer)
+    if lo < index.first or hi > index.last:
+        raise ValueError(f"dates are indexed from {FIRST_YEAR}-01-01 to {LAST_YEAR}-12-31")
+    hits = index.query(criteria, lo, hi)
+    return {
+        "system": rules.name,
+        "criteria": dict(criteria),
+        "start": start,
+        "end": end,
+        "total": len(hits),
+        "dates": [datetime.date.fromordinal(o).isoformat() for o in hits[offset:offset + limit]],
+    }
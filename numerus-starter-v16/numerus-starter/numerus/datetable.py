@@ -0,0 +1,131 @@
+from __future__ import annotations
+import argparse, datetime, mmap, os, struct, zlib
+from typing import Dict, Optional, Tuple
+
+from .reduction import Reducer
+
+# Every DOB-derived number depends only on the date and the system's
+# reduction policy, so they are materialized once per policy into a flat
+# binary table (one fixed-size record per day) and memory-mapped read-only.
+# Workers mapping the same file share its pages through the OS page cache.
+#
+# Build:  python -m numerus.datetable            (all policies in systems/)
+# Record: digit_sum, md_digit_sum, rm, rd, ry, life_path, birthday,
+#         p1..p4, c1..c4, lo_shu[1..9]  -- one unsigned byte each
+
+TABLE_DIR = os.getenv("NUMERUS_DATE_TABLES", os.path.join(os.path.dirname(__file__), "datetables"))
+FIRST_YEAR = 1800
+LAST_YEAR = 2200
+
+MAGIC = b"NUMDATE2"
+FORMAT_VERSION = 2  # bump when the record layout or the date arithmetic changes
+RECORD_SIZE = 24
+_HEADER = struct.Struct("<8sHHiII")  # magic, record size, version, first ordinal, record count, fingerprint
+# Probe days (about 60, spread over 1800..2200) whose records make up the fingerprint
+_PROBES = range(datetime.date(1800, 1, 1).toordinal(), datetime.date(2200, 12, 31).toordinal(), 2459)
+
+def _record(dp) -> bytes:
+    return bytes(dp[3:10]) + bytes(dp.pinnacles) + bytes(dp.challenges) + bytes(dp.lo_shu)
+
+def fingerprint(reducer: Reducer) -> int:
+    """CRC of the records the current code computes for the probe days: a table
+    built by different reducer or engine code carries a different fingerprint."""
+    from .engine import compute_date_profile
+
+    crc = zlib.crc32(struct.pack("<H", FORMAT_VERSION))
+    for o in _PROBES:
+        day = datetime.date.fromordinal(o)
+        crc = zlib.crc32(_record(compute_date_profile(day.year, day.month, day.day, reducer)), crc)
+    return crc
+
+class DateTable:
+    __slots__ = ("path", "first", "count", "version", "fingerprint", "_buf", "_file")
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, size, self.version, self.first, self.count, self.fingerprint = _HEADER.unpack_from(self._buf, 0)
+            if magic != MAGIC or size != RECORD_SIZE or len(self._buf) != _HEADER.size + self.count * RECORD_SIZE:
+                raise ValueError(f"Corrupt date table: {path}")
+        except Exception:
+            self._file.close()
+            raise
+        self.path = path
+
+    def record(self, y: int, m: int, d: int) -> Optional[bytes]:
+        try:
+            i = datetime.date(y, m, d).toordinal() - self.first
+        except (ValueError, OverflowError):
+            return None
+        if not 0 <= i < self.count:
+            return None
+        off = _HEADER.size + i * RECORD_SIZE
+        return self._buf[off:off + RECORD_SIZE]
+
+def table_name(reducer: Reducer) -> str:
+    method, masters = reducer.policy
+    return f"dates-{method}-{'-'.join(map(str, sorted(masters))) or 'none'}.bin"
+
+_TABLES: Dict[Tuple, Optional[DateTable]] = {}
+
+def date_table(reducer: Reducer) -> Optional[DateTable]:
+    """Memory-mapped table for this reduction policy, or None if not built (or
+    built by another format version or different date arithmetic)."""
+    key = reducer.policy
+    try:
+        return _TABLES[key]
+    except KeyError:
+        pass
+    path = os.path.join(TABLE_DIR, table_name(reducer))
+    table = None
+    if os.path.exists(path):
+        try:
+            table = DateTable(path)
+        except (OSError, ValueError, struct.error):
+            table = None
+        if table is not None and (table.version != FORMAT_VERSION or table.fingerprint != fingerprint(reducer)):
+            table = None  # stale: computing beats serving numbers the code no longer produces
+    _TABLES[key] = table
+    return table
+
+def build(reducer: Reducer, directory: str = TABLE_DIR,
+          first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> str:
+    from .engine import compute_date_profile
+
+    if max(reducer.policy[1], default=0) > 255:
+        raise ValueError("date tables store one byte per number; master numbers must be <= 255")
+    first = datetime.date(first_year, 1, 1).toordinal()
+    last = datetime.date(last_year, 12, 31).toordinal()
+    out = bytearray(_HEADER.pack(MAGIC, RECORD_SIZE, FORMAT_VERSION, first, last - first + 1, fingerprint(reducer)))
+    for o in range(first, last + 1):
+        day = datetime.date.fromordinal(o)
+        out += _record(compute_date_profile(day.year, day.month, day.day, reducer))
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, table_name(reducer))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, path)  # atomic: readers never see a half-written table
+    return path
+
+def main(argv=None) -> None:
+    from .rules import DATA_DIR, SystemRules
+
+    ap = argparse.ArgumentParser(description="Build memory-mapped DOB tables for every system policy.")
+    ap.add_argument("--out", default=TABLE_DIR)
+    ap.add_argument("--first-year", type=int, default=FIRST_YEAR)
+    ap.add_argument("--last-year", type=int, default=LAST_YEAR)
+    args = ap.parse_args(argv)
+    seen = set()
+    for fn in sorted(os.listdir(DATA_DIR)):
+        if not fn.endswith(".json"):
+            continue
+        reducer = SystemRules.load(fn[:-5]).reducer
+        if reducer.policy in seen:
+            continue
+        seen.add(reducer.policy)
+        print(build(reducer, args.out, args.first_year, args.last_year))
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,22 @@ _BASE = {
 
 def _b(n:int): return _BASE.get(n, {"name": f"{n}","keywords":[],"plus":"","minus":"","advice":""})
 
+def _render_brief(n: int) -> Dict:
+    b = _b(n)
+    return {
+        "summary": f"{b['name']}",
+        "strengths": b["plus"],
+        "pitfalls": b["minus"],
+        "advice": b["advice"]
+    }
+
+# Rendered once at import, like reporter.FRAGMENTS; callers get their own copy
+_BRIEFS = {n: _render_brief(n) for n in _BASE}
+
+def _brief(n: int) -> Dict:
+    b = _BRIEFS.get(n)
+    return dict(b) if b is not None else _render_brief(n)
+
 def describe_block(title: str, text: str) -> str:
     return f"**{title}.** {text}"
 
@@ -36,20 +52,13 @@ def compose(numerics: Dict, full_name: str, date_of_birth: str, system: str = "P
     grid = numerics.get("lo_shu", {})
     lessons = numerics.get("karmic_lessons", [])
 
-    def brief(n): b=_b(n); return {
-        "summary": f"{b['name']}",
-        "strengths": b["plus"],
-        "pitfalls": b["minus"],
-        "advice": b["advice"]
-    }
-
     core = {
-        "life_path": brief(lp) if lp else None,
-        "expression": brief(ex) if ex else None,
-        "soul_urge": brief(su) if su else None,
-        "personality": brief(pe) if pe else None,
-        "birthday": brief(bd) if bd else None,
-        "maturity": brief(ma) if ma else None,
+        "life_path": _brief(lp) if lp else None,
+        "expression": _brief(ex) if ex else None,
+        "soul_urge": _brief(su) if su else None,
+        "personality": _brief(pe) if pe else None,
+        "birthday": _brief(bd) if bd else None,
+        "maturity": _brief(ma) if ma else None,
     }
 
     cycles = {
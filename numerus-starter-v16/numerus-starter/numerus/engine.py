@@ -1,164 +1,176 @@
 
 from __future__ import annotations
-from typing import Dict, List, Tuple, Set
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Set
+from array import array
 from dataclasses import dataclass
-import datetime, re
+import copy, datetime
 
-from .rules import SystemRules, normalize_name
+from .datetable import date_table
+from .reduction import Reducer
+from .rules import LetterCodec, SystemRules, TokenScore, normalize_name
 
 TRACE_DEBTS = {13,14,16,19}
 
+DISCLAIMER = (
+    "Numerology is not science. Treat this as entertainment and reflective prompts, not factual claims. "
+    "We do not use gender in calculations unless a system explicitly defines it."
+)
+
 DIGITS = set("0123456789")
 
 def reduce_number(n: int, rules: SystemRules) -> int:
-    # Classic reduction: keep master numbers if configured
-    if n < 10:
-        return n
-    if rules.keep_master and n in rules.master_numbers:
-        return n
-    s = sum(int(d) for d in str(n))
-    if rules.keep_master and s in rules.master_numbers:
-        return s
-    while s >= 10:
-        if rules.keep_master and s in rules.master_numbers:
-            break
-        s = sum(int(d) for d in str(s))
-    return s
+    # Table-driven, honors reduce_method / keep_master / reduce_master (see reduction.py)
+    return rules.reducer(n)
+
+class NameProfile(NamedTuple):
+    """Everything the name metrics need, from a single scan of the name."""
+    letters: str
+    vowels: str
+    consonants: str
+    vowel_sum: int
+    consonant_sum: int
+    total: int
+    value_counts: Tuple[int, ...]  # value_counts[v] = letters worth v, for v in 0..9
+
+class DateProfile(NamedTuple):
+    """Every DOB-derived number for one master policy (see datetable.py)."""
+    year: int
+    month: int
+    day: int
+    digit_sum: int     # sum of all digits of YYYYMMDD
+    md_digit_sum: int  # sum of the MMDD digits (personal year base)
+    rm: int            # reduced month/day/year
+    rd: int
+    ry: int
+    life_path: int
+    birthday: int
+    pinnacles: Tuple[int, int, int, int]
+    challenges: Tuple[int, int, int, int]
+    lo_shu: Tuple[int, ...]  # lo_shu[k - 1] = count of digit k, for k in 1..9
+
+def _digit_sum(n: int) -> int:
+    return sum(map(int, str(n)))
+
+_NO_TOKENS = ((), (), (), (), (), ())
+
+def name_profile(full_name: str, rules: SystemRules) -> NameProfile:
+    # Sum of per-token scores; names reuse a small vocabulary, so tokens are memoized per system
+    return _combine_tokens(rules.codec.tokens(full_name), rules.codec)
+
+def _combine_tokens(parts: Sequence[TokenScore], codec: LetterCodec) -> NameProfile:
+    # Token scores add up: the profile of a name is the sum of its tokens' profiles
+    if len(parts) == 1:
+        letters, vowels, consonants, v, c, packed = parts[0]
+    else:
+        cols = tuple(zip(*parts)) or _NO_TOKENS
+        letters, vowels, consonants = "".join(cols[0]), "".join(cols[1]), "".join(cols[2])
+        v, c, packed = sum(cols[3]), sum(cols[4]), sum(cols[5])
+    return NameProfile(letters, vowels, consonants, v, c, v + c, codec.value_counts(packed, letters))
+
+def compute_date_profile(y: int, m: int, d: int, reduce: Callable[[int], int]) -> DateProfile:
+    md = _digit_sum(m) + _digit_sum(d)
+    digit_sum = _digit_sum(y) + md
+    rm, rd, ry = reduce(m), reduce(d), reduce(y)
+    p1 = reduce(rm + rd)
+    p2 = reduce(rd + ry)
+    p3 = reduce(p1 + p2)
+    p4 = reduce(rm + ry)
+    c1 = abs(rm - rd)
+    c2 = abs(rd - ry)
+    c3 = abs(c1 - c2)
+    c4 = abs(rm - ry)
+    digits = f"{y:04d}{m:02d}{d:02d}"
+    return DateProfile(
+        y, m, d, digit_sum, md, rm, rd, ry,
+        life_path=reduce(digit_sum),
+        birthday=reduce(d),
+        pinnacles=(p1, p2, p3, p4),
+        challenges=(reduce(c1), reduce(c2), reduce(c3), reduce(c4)),
+        lo_shu=tuple(digits.count(k) for k in "123456789"),
+    )
+
+def date_profile(dob: str, rules: SystemRules) -> DateProfile:
+    y, m, d = date_parts(dob)
+    return lookup_date_profile(y, m, d, rules.reducer)
+
+def lookup_date_profile(y: int, m: int, d: int, reducer: Reducer) -> DateProfile:
+    # O(1) read from the memory-mapped table when one is built for this policy
+    table = date_table(reducer)
+    if table is not None:
+        r = table.record(y, m, d)
+        if r is not None:
+            return DateProfile(y, m, d, *r[:7], tuple(r[7:11]), tuple(r[11:15]), tuple(r[15:]))
+    return compute_date_profile(y, m, d, reducer)
+
+def canonical_name(full_name: str, rules: SystemRules, trace: bool = False) -> str:
+    # The scored letters in order: case, diacritics the system folds away, spaces and
+    # punctuation do not change any result, so names with equal keys analyze identically.
+    # Without a trace only each letter's value and vowel/consonant class matter, so
+    # letters are folded to one representative per class ("Ễ" and "E" key alike).
+    letters = "".join(p[0] for p in rules.codec.tokens(full_name))
+    return letters if trace else letters.translate(rules.codec.fold)
 
 def letters_of(name: str, rules: SystemRules) -> Tuple[List[str], List[str]]:
     # Returns (vowels, consonants) after normalization and uppercasing
-    normalized = normalize_name(name, rules.normalization).upper()
-    # Keep only A-Z and spaces
-    filtered = re.sub(r"[^A-Z\s]", "", normalized)
-    parts = filtered.split()
-    vowels, consonants = [], []
-    for ch in filtered:
-        if ch == " ":
-            continue
-        key = ch.upper()
-        if key not in rules.char_map:
-            continue
-        if key == "Y":
-            if rules.include_y_as_vowel:
-                vowels.append(key)
-            else:
-                consonants.append(key)
-        elif key in rules.vowels:
-            vowels.append(key)
-        else:
-            consonants.append(key)
-    return vowels, consonants
+    v, c = rules.codec.split(rules.codec.letters(name))
+    return list(v), list(c)
 
 def letters_all(name: str, rules: SystemRules) -> List[str]:
-    normalized = normalize_name(name, rules.normalization).upper()
-    filtered = re.sub(r"[^A-Z\s]", "", normalized)
-    return [ch for ch in filtered if ch != " "]
+    return list(rules.codec.letters(name))
 
 def sum_letters(letters: List[str], rules: SystemRules) -> int:
-    total = 0
-    for ch in letters:
-        total += rules.char_map.get(ch, 0)
-    return total
+    return rules.codec.total("".join(letters))
 
 def date_parts(dob: str) -> Tuple[int, int, int]:
     # dob = YYYY-MM-DD
     y, m, d = map(int, dob.split("-"))
     return y, m, d
 
-def life_path(dob: str, rules: SystemRules) -> int:
-    y, m, d = date_parts(dob)
-    # sum of all digits (with master rule)
-    total = sum(int(c) for c in f"{y:04d}{m:02d}{d:02d}")
-    return reduce_number(total, rules)
-
-def birthday_number(dob: str, rules: SystemRules) -> int:
-    day = int(dob.split("-")[2])
-    return reduce_number(day, rules)
-
-def expression_number(full_name: str, rules: SystemRules) -> int:
-    letters = letters_all(full_name, rules)
-    return reduce_number(sum_letters(letters, rules), rules)
-
-def soul_urge_number(full_name: str, rules: SystemRules) -> int:
-    v, _ = letters_of(full_name, rules)
-    return reduce_number(sum_letters(v, rules), rules)
-
-def personality_number(full_name: str, rules: SystemRules) -> int:
-    _, c = letters_of(full_name, rules)
-    return reduce_number(sum_letters(c, rules), rules)
+# ---- metrics over profiles (each profile is built once per analysis) ----
 
-def maturity_number(full_name: str, dob: str, rules: SystemRules) -> int:
-    lp = life_path(dob, rules)
-    ex = expression_number(full_name, rules)
-    return reduce_number(lp + ex, rules)
+def _life_path(dp: DateProfile, rules: SystemRules) -> int:
+    return dp.life_path
 
-def karmic_debts(n: int) -> List[int]:
-    debts = []
-    for kd in (13, 14, 16, 19):
-        if n == kd or any(sum(int(d) for d in str(v)) == kd for v in (n,)):
-            # We only mark the configuration number itself; detailed placement is in report composition.
-            pass
-    # Standard presentation is to tag if any calculated raw sums hit these numbers before reduction;
-    # We will expose where they occurred in the analysis (implemented below).
-    return [13, 14, 16, 19]
+def _birthday(dp: DateProfile, rules: SystemRules) -> int:
+    return dp.birthday
 
-def compute_karmic_lessons(full_name: str, rules: SystemRules) -> List[int]:
-    # Which digit-values 1..9 are missing in the name mapping distribution
-    letters = letters_all(full_name, rules)
-    seen = set(rules.char_map.get(ch, 0) for ch in letters if ch in rules.char_map)
-    return [d for d in range(1, 10) if d not in seen]
+def _expression(nm: NameProfile, rules: SystemRules) -> int:
+    return reduce_number(nm.total, rules)
 
-def pinnacles_and_challenges(dob: str, rules: SystemRules):
-    y, m, d = date_parts(dob)
+def _soul_urge(nm: NameProfile, rules: SystemRules) -> int:
+    return reduce_number(nm.vowel_sum, rules)
 
-    rm = reduce_number(m, rules)
-    rd = reduce_number(d, rules)
-    ry = reduce_number(y, rules)
+def _personality(nm: NameProfile, rules: SystemRules) -> int:
+    return reduce_number(nm.consonant_sum, rules)
 
-    p1 = reduce_number(rm + rd, rules)
-    p2 = reduce_number(rd + ry, rules)
-    p3 = reduce_number(p1 + p2, rules)
-    p4 = reduce_number(rm + ry, rules)
+def _maturity(lp: int, ex: int, rules: SystemRules) -> int:
+    return reduce_number(lp + ex, rules)
 
-    c1 = abs(rm - rd)
-    c2 = abs(rd - ry)
-    c3 = abs(c1 - c2)
-    c4 = abs(rm - ry)
+def _karmic_lessons(nm: NameProfile) -> List[int]:
+    return [d for d in range(1, 10) if not nm.value_counts[d]]
 
+def _pinnacles_and_challenges(life_path: int, pinnacles, challenges) -> Dict:
     # age cycles (standard scheme: first pinnacle to 36 - life_path, then 9-year cycles)
-    lp = life_path(dob, rules)
-    first_transition_age = 36 - lp
+    first_transition_age = 36 - life_path
     return {
-        "pinnacles": [p1, p2, p3, p4],
-        "challenges": [reduce_number(c1, rules), reduce_number(c2, rules),
-                       reduce_number(c3, rules), reduce_number(c4, rules)],
+        "pinnacles": list(pinnacles),
+        "challenges": list(challenges),
         "transition_ages": [first_transition_age, first_transition_age + 9, first_transition_age + 18, first_transition_age + 27]
     }
 
-
-
-def life_pyramid(dob: str, rules: SystemRules):
+def _life_pyramid(base, p) -> Dict:
     # Working convention:
     # Base row: reduced Month (M), Day (D), Year (Y)
-    # Next row: L = reduce(M + D), R = reduce(D + Y)
-    # Apex: A = reduce(L + R)
-    # Return structure and a simple age mapping aligned with pinnacles transitions.
-    y, m, d = date_parts(dob)
-    M = reduce_number(m, rules)
-    D = reduce_number(d, rules)
-    Y = reduce_number(y, rules)
-    L = reduce_number(M + D, rules)
-    R = reduce_number(D + Y, rules)
-    A = reduce_number(L + R, rules)
+    # Next row: L = reduce(M + D), R = reduce(D + Y)   (= pinnacles 1 and 2)
+    # Apex: A = reduce(L + R)                          (= pinnacle 3)
     return {
-        "base": [M, D, Y],
-        "mid": [L, R],
-        "apex": A
+        "base": list(base),
+        "mid": [p[0], p[1]],
+        "apex": p[2]
     }
 
-def detailed_pinnacles(dob: str, rules: SystemRules):
-    data = pinnacles_and_challenges(dob, rules)
-    p = data["pinnacles"]; c = data["challenges"]; ages = data["transition_ages"]
+def _detailed_pinnacles(pc: Dict) -> List[Dict]:
+    p = pc["pinnacles"]; c = pc["challenges"]; ages = pc["transition_ages"]
     out = []
     spans = [
         (None, ages[0]),
@@ -176,11 +188,97 @@ def detailed_pinnacles(dob: str, rules: SystemRules):
         })
     return out
 
+def _personal_year(dp: DateProfile, target_year: int, rules: SystemRules) -> int:
+    return reduce_number(_digit_sum(target_year) + dp.md_digit_sum, rules)
+
+def _personal_month(py: int, month: int, rules: SystemRules) -> int:
+    return reduce_number(py + month, rules)
+
+def _personal_day(pm: int, day: int, rules: SystemRules) -> int:
+    return reduce_number(pm + day, rules)
+
+# Sums before reduction, in trace order; karmic debts are looked for among them
+_RAW_LABELS = ("life_path_total", "birthday_day", "expression_total", "soul_urge_total", "personality_total",
+               "maturity_total", "p1_raw", "p2_raw", "p3_raw", "p4_raw", "c1_raw", "c2_raw", "c3_raw", "c4_raw")
+_DEBTS = (13, 14, 16, 19)
+
+def _raw_totals(dp: DateProfile, nm: NameProfile) -> Tuple[int, ...]:
+    rm, rd, ry = dp.rm, dp.rd, dp.ry
+    p = dp.pinnacles
+    return (dp.digit_sum, dp.day, nm.total, nm.vowel_sum, nm.consonant_sum,
+            dp.digit_sum + nm.total,  # lp (pre-red) + expression (pre-red)
+            rm + rd, rd + ry, p[0] + p[1], rm + ry,
+            abs(rm - rd), abs(rd - ry), abs(abs(rm - rd) - abs(rd - ry)), abs(rm - ry))
+
+def _karmic_debt_hits(totals: Tuple[int, ...]) -> List[Dict]:
+    # Where 13/14/16/19 appear before reduction
+    return [{"where": label, "value": v} for label, v in zip(_RAW_LABELS, totals) if v in TRACE_DEBTS]
+
+def _lo_shu(counts) -> Dict[str, int]:
+    return {str(k): counts[k - 1] for k in range(1, 10)}
+
+# ---- public per-metric API (thin wrappers kept for callers and tests) ----
+
+def life_path(dob: str, rules: SystemRules) -> int:
+    return _life_path(date_profile(dob, rules), rules)
+
+def birthday_number(dob: str, rules: SystemRules) -> int:
+    return _birthday(date_profile(dob, rules), rules)
+
+def expression_number(full_name: str, rules: SystemRules) -> int:
+    return _expression(name_profile(full_name, rules), rules)
+
+def soul_urge_number(full_name: str, rules: SystemRules) -> int:
+    return _soul_urge(name_profile(full_name, rules), rules)
+
+def personality_number(full_name: str, rules: SystemRules) -> int:
+    return _personality(name_profile(full_name, rules), rules)
+
+def maturity_number(full_name: str, dob: str, rules: SystemRules) -> int:
+    return _maturity(life_path(dob, rules), expression_number(full_name, rules), rules)
+
+def karmic_debts(n: int) -> List[int]:
+    debts = []
+    for kd in (13, 14, 16, 19):
+        if n == kd or any(sum(int(d) for d in str(v)) == kd for v in (n,)):
+            # We only mark the configuration number itself; detailed placement is in report composition.
+            pass
+    # Standard presentation is to tag if any calculated raw sums hit these numbers before reduction;
+    # We will expose where they occurred in the analysis (implemented below).
+    return [13, 14, 16, 19]
+
+def compute_karmic_lessons(full_name: str, rules: SystemRules) -> List[int]:
+    # Which digit-values 1..9 are missing in the name mapping distribution
+    return _karmic_lessons(name_profile(full_name, rules))
+
+def pinnacles_and_challenges(dob: str, rules: SystemRules):
+    dp = date_profile(dob, rules)
+    return _pinnacles_and_challenges(dp.life_path, dp.pinnacles, dp.challenges)
+
+def life_pyramid(dob: str, rules: SystemRules):
+    dp = date_profile(dob, rules)
+    return _life_pyramid((dp.rm, dp.rd, dp.ry), dp.pinnacles)
+
+def detailed_pinnacles(dob: str, rules: SystemRules):
+    return _detailed_pinnacles(pinnacles_and_challenges(dob, rules))
 
 def personal_year(dob: str, target_year: int, rules: SystemRules) -> int:
-    y, m, d = date_parts(dob)
-    total = sum(int(c) for c in f"{target_year:04d}{m:02d}{d:02d}")
-    return reduce_number(total, rules)
+    return _personal_year(date_profile(dob, rules), target_year, rules)
+
+def personal_month(dob: str, target_year: int, month: int, rules: SystemRules) -> int:
+    # Personal year of target_year plus the calendar month, reduced
+    if not 1 <= month <= 12:
+        raise ValueError("month must be 1..12")
+    return _personal_month(personal_year(dob, target_year, rules), month, rules)
+
+def personal_day(dob: str, day: str, rules: SystemRules) -> int:
+    # Personal month of the day's month plus the day of month, reduced
+    try:
+        y, m, d = date_parts(day)
+        datetime.date(y, m, d)
+    except Exception:
+        raise ValueError("day must be YYYY-MM-DD and valid")
+    return _personal_day(personal_month(dob, y, m, rules), d, rules)
 
 def lo_shu_grid(dob: str) -> Dict[str, int]:
     digits = [c for c in dob if c.isdigit()]
@@ -190,6 +288,74 @@ def lo_shu_grid(dob: str) -> Dict[str, int]:
             counts[d] += 1
     return counts
 
+# ---- metric graph ----
+# Each metric is a node with named dependencies. analyze() evaluates only the
+# requested public nodes plus what they depend on, each at most once.
+
+class MetricNode(NamedTuple):
+    deps: Tuple[str, ...]
+    fn: Callable
+    public: bool  # public nodes appear in report["numbers"]
+
+_REGISTRY: Dict[str, MetricNode] = {}
+
+def register_metric(name: str, *deps: str, public: bool = True):
+    """Decorator: ``fn(ev, *dep_values)`` computes metric ``name``.
+
+    ``ev`` is the running evaluation (``ev.inp``, ``ev.rules``). Custom
+    metrics registered this way are computed and reported like built-ins.
+    """
+    def deco(fn):
+        missing = [d for d in deps if d not in _REGISTRY]
+        if missing:
+            raise ValueError(f"Unknown dependencies for {name}: {missing}")
+        _REGISTRY[name] = MetricNode(tuple(deps), fn, public)
+        return fn
+    return deco
+
+def available_fields() -> List[str]:
+    return [k for k, node in _REGISTRY.items() if node.public]
+
+class Evaluation:
+    __slots__ = ("inp", "rules", "values")
+
+    def __init__(self, inp: "AnalysisInput", rules: SystemRules):
+        self.inp = inp
+        self.rules = rules
+        self.values: Dict[str, object] = {}
+
+    def __getitem__(self, name: str):
+        try:
+            return self.values[name]
+        except KeyError:
+            pass
+        node = _REGISTRY[name]
+        value = self.values[name] = node.fn(self, *[self[d] for d in node.deps])
+        return value
+
+register_metric("date_profile", public=False)(lambda ev: date_profile(ev.inp.date_of_birth, ev.rules))
+register_metric("name_profile", public=False)(lambda ev: name_profile(ev.inp.full_name, ev.rules))
+register_metric("raw_totals", "date_profile", "name_profile", public=False)(lambda ev, dp, nm: _raw_totals(dp, nm))
+register_metric("pinnacle_cycle", "date_profile", public=False)(
+    lambda ev, dp: _pinnacles_and_challenges(dp.life_path, dp.pinnacles, dp.challenges))
+
+register_metric("life_path", "date_profile")(lambda ev, dp: _life_path(dp, ev.rules))
+register_metric("birthday", "date_profile")(lambda ev, dp: _birthday(dp, ev.rules))
+register_metric("expression", "name_profile")(lambda ev, nm: _expression(nm, ev.rules))
+register_metric("soul_urge", "name_profile")(lambda ev, nm: _soul_urge(nm, ev.rules))
+register_metric("personality", "name_profile")(lambda ev, nm: _personality(nm, ev.rules))
+register_metric("maturity", "life_path", "expression")(lambda ev, lp, ex: _maturity(lp, ex, ev.rules))
+register_metric("pinnacles", "pinnacle_cycle")(lambda ev, pc: pc["pinnacles"])
+register_metric("challenges", "pinnacle_cycle")(lambda ev, pc: pc["challenges"])
+register_metric("transition_ages", "pinnacle_cycle")(lambda ev, pc: pc["transition_ages"])
+register_metric("personal_year", "date_profile")(
+    lambda ev, dp: _personal_year(dp, ev.inp.target_year or datetime.date.today().year, ev.rules))
+register_metric("lo_shu", "date_profile")(lambda ev, dp: _lo_shu(dp.lo_shu))
+register_metric("life_pyramid", "date_profile")(lambda ev, dp: _life_pyramid((dp.rm, dp.rd, dp.ry), dp.pinnacles))
+register_metric("pinnacles_detailed", "pinnacle_cycle")(lambda ev, pc: _detailed_pinnacles(pc))
+register_metric("karmic_lessons", "name_profile")(lambda ev, nm: _karmic_lessons(nm))
+register_metric("karmic_debt_hits", "raw_totals")(lambda ev, totals: _karmic_debt_hits(totals))
+
 @dataclass
 class AnalysisInput:
     full_name: str
@@ -197,120 +363,187 @@ class AnalysisInput:
     gender: str | None = None
     system: str = "pythagorean"
     target_year: int | None = None
+    fields: List[str] | None = None  # public metrics to compute; None = all
+
+# ---- compact results ----
+# One int array per result: the scalar metrics, pinnacles, challenges, the
+# pyramid base (reduced M, D, Y), Lo Shu counts 1..9, a karmic-lessons
+# bitmask and the karmic-debt hits (bit i = _RAW_LABELS[i] hit, with a
+# 2-bit index into _DEBTS per label). Everything else in report["numbers"]
+# is derived from these.
+_SCALARS = ("life_path", "birthday", "expression", "soul_urge", "personality", "maturity", "personal_year")
+_P, _C, _BASE, _LOSHU, _LESSONS, _DEBT_AT, _DEBT_OF = 7, 11, 15, 18, 27, 28, 29
+_NSLOTS = 30
+
+def _cycle(a: array) -> Dict:
+    return _pinnacles_and_challenges(a[0], a[_P:_C], a[_C:_BASE])
+
+_DECODE: Dict[str, Callable[[array], object]] = {
+    **{name: (lambda a, i=i: a[i]) for i, name in enumerate(_SCALARS)},
+    "pinnacles": lambda a: a[_P:_C].tolist(),
+    "challenges": lambda a: a[_C:_BASE].tolist(),
+    "transition_ages": lambda a: _cycle(a)["transition_ages"],
+    "lo_shu": lambda a: _lo_shu(a[_LOSHU:_LESSONS]),
+    "life_pyramid": lambda a: _life_pyramid(a[_BASE:_LOSHU], a[_P:_C]),
+    "pinnacles_detailed": lambda a: _detailed_pinnacles(_cycle(a)),
+    "karmic_lessons": lambda a: [d for d in range(1, 10) if a[_LESSONS] >> d & 1],
+    "karmic_debt_hits": lambda a: [{"where": label, "value": _DEBTS[a[_DEBT_OF] >> 2 * i & 3]}
+                                   for i, label in enumerate(_RAW_LABELS) if a[_DEBT_AT] >> i & 1],
+}
+
+_FIELD_SETS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}  # interned, shared by all results
+
+class AnalysisResult:
+    """Compact form of an ``analyze()`` report.
+
+    Built-in numbers live in a small int array and are expanded to the JSON
+    shape only by ``to_dict()``; custom metrics are kept as computed. Hold
+    these rather than dicts when keeping many results (caches, batches).
+    """
+    __slots__ = ("system", "full_name", "date_of_birth", "gender", "fields", "_ints", "_extra", "_trace")
+
+    def __init__(self, system: str, inp: AnalysisInput, fields: Tuple[str, ...], ints: array,
+                 extra: Optional[Dict] = None, trace: Optional[Dict] = None):
+        self.system = system
+        self.full_name = inp.full_name
+        self.date_of_birth = inp.date_of_birth
+        self.gender = inp.gender
+        self.fields = _FIELD_SETS.setdefault(fields, fields)
+        self._ints = ints
+        self._extra = extra
+        self._trace = trace
+
+    @classmethod
+    def from_evaluation(cls, ev: "Evaluation", fields: Tuple[str, ...], trace: Optional[Dict] = None) -> "AnalysisResult":
+        values = ev.values
+        dp = values["date_profile"]
+        a = array("i", bytes(4 * _NSLOTS))
+        a[0], a[1] = dp.life_path, dp.birthday
+        a[_P:_BASE] = array("i", dp.pinnacles + dp.challenges)
+        a[_BASE:_LOSHU] = array("i", (dp.rm, dp.rd, dp.ry))
+        a[_LOSHU:_LESSONS] = array("i", dp.lo_shu)
+        for i in range(2, len(_SCALARS)):
+            if _SCALARS[i] in values:
+                a[i] = values[_SCALARS[i]]
+        if "karmic_lessons" in values:
+            a[_LESSONS] = sum(1 << d for d in values["karmic_lessons"])
+        if "karmic_debt_hits" in values:
+            for hit in values["karmic_debt_hits"]:
+                i = _RAW_LABELS.index(hit["where"])
+                a[_DEBT_AT] |= 1 << i
+                a[_DEBT_OF] |= _DEBTS.index(hit["value"]) << 2 * i
+        extra = {name: values[name] for name in fields if name not in _DECODE} or None
+        return cls(ev.rules.name, ev.inp, fields, a, extra, trace)
+
+    def numbers(self) -> Dict:
+        a, extra = self._ints, self._extra
+        return {name: _DECODE[name](a) if name in _DECODE else extra[name] for name in self.fields}
+
+    def to_dict(self) -> Dict:
+        return {
+            "system": self.system,
+            "input": {"full_name": self.full_name, "date_of_birth": self.date_of_birth, "gender": self.gender},
+            "numbers": self.numbers(),
+            # Results are cached and shared: every caller gets its own (nested) trace
+            "trace": copy.deepcopy(self._trace) if self._trace is not None else {"enabled": False},
+            "disclaimer": DISCLAIMER,
+        }
 
 def analyze(inp: AnalysisInput, rules: SystemRules, trace: bool = False) -> Dict:
+    return analyze_result(inp, rules, trace).to_dict()
+
+def analyze_result(inp: AnalysisInput, rules: SystemRules, trace: bool = False) -> AnalysisResult:
+    return _analyze(Evaluation(inp, rules), _requested_fields(inp), trace)
+
+def analyze_multi(inp: AnalysisInput, systems: Sequence[SystemRules], trace: bool = False) -> List[AnalysisResult]:
+    """``analyze_result`` for several systems with one input.
+
+    The date profile is computed once per reduction policy. The name is
+    normalized once per normalization mode and profiled once per distinct set
+    of letter tables (``LetterCodec.key``); systems sharing them reuse the values.
+    """
+    fields = _requested_fields(inp)
+    need_name = trace or "name_profile" in _dependencies(fields)
+    dates: Dict[tuple, DateProfile] = {}
+    folded: Dict[str, List[str]] = {}
+    names: Dict[tuple, NameProfile] = {}
+    results = []
+    for rules in systems:
+        ev = Evaluation(inp, rules)
+        policy, codec = rules.reducer.policy, rules.codec
+        if policy in dates:
+            ev.values["date_profile"] = dates[policy]
+        if need_name:
+            nm = names.get(codec.key)
+            if nm is None:
+                tokens = folded.get(codec.normalization)
+                if tokens is None:
+                    tokens = folded[codec.normalization] = [normalize_name(t, codec.normalization).upper()
+                                                            for t in inp.full_name.split()]
+                nm = names[codec.key] = _combine_tokens([codec.score_folded(t) for t in tokens], codec)
+            ev.values["name_profile"] = nm
+        results.append(_analyze(ev, fields, trace))
+        dates.setdefault(policy, ev.values["date_profile"])
+    return results
+
+def _dependencies(fields: Tuple[str, ...]) -> frozenset:
+    # Every metric the given fields are computed from, themselves included
+    seen, stack = set(), list(fields)
+    while stack:
+        name = stack.pop()
+        if name not in seen:
+            seen.add(name)
+            stack.extend(_REGISTRY[name].deps)
+    return frozenset(seen)
+
+def _requested_fields(inp: AnalysisInput) -> Tuple[str, ...]:
+    if inp.fields is not None:
+        unknown = [f for f in inp.fields if f not in _REGISTRY or not _REGISTRY[f].public]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    wanted = set(inp.fields) if inp.fields is not None else None
+    return tuple(name for name, node in _REGISTRY.items()
+                 if node.public and (wanted is None or name in wanted))
+
+def _analyze(ev: Evaluation, fields: Tuple[str, ...], trace: bool) -> AnalysisResult:
     # Basic validation
     try:
-        y, m, d = inp.date_of_birth.split("-")
-        _ = datetime.date(int(y), int(m), int(d))
+        dp = ev["date_profile"]
+        _ = datetime.date(dp.year, dp.month, dp.day)
     except Exception as e:
         raise ValueError("date_of_birth must be YYYY-MM-DD and valid")
 
-    report: Dict = {"system": rules.name, "input": {"full_name": inp.full_name, "date_of_birth": inp.date_of_birth, "gender": inp.gender}}
-
-    lp = life_path(inp.date_of_birth, rules)
-    bd = birthday_number(inp.date_of_birth, rules)
-    ex = expression_number(inp.full_name, rules)
-    su = soul_urge_number(inp.full_name, rules)
-    pe = personality_number(inp.full_name, rules)
-    ma = maturity_number(inp.full_name, inp.date_of_birth, rules)
-
-    pc = pinnacles_and_challenges(inp.date_of_birth, rules)
-    py = personal_year(inp.date_of_birth, inp.target_year or datetime.date.today().year, rules)
-    grid = lo_shu_grid(inp.date_of_birth)
-    lessons = compute_karmic_lessons(inp.full_name, rules)
-
-    report["numbers"] = {
-        "life_path": lp,
-        "birthday": bd,
-        "expression": ex,
-        "soul_urge": su,
-        "personality": pe,
-        "maturity": ma,
-        "pinnacles": pc["pinnacles"],
-        "challenges": pc["challenges"],
-        "transition_ages": pc["transition_ages"],
-        "personal_year": py,
-        "lo_shu": grid,
-        "life_pyramid": life_pyramid(inp.date_of_birth, rules),
-        "pinnacles_detailed": detailed_pinnacles(inp.date_of_birth, rules),
-        "karmic_lessons": lessons
-    }
+    for name in fields:
+        ev[name]
 
-    # Build detailed trace if requested
+    # Build detailed trace if requested: every value below was already computed
     if trace:
+        nm = ev["name_profile"]
+        totals = dict(zip(_RAW_LABELS, ev["raw_totals"]))
         raw = {}
         # DOB components
-        y, m, d = date_parts(inp.date_of_birth)
         raw["dob"] = {
-            "year": y, "month": m, "day": d,
-            "sum_all_digits": sum(int(c) for c in f"{y:04d}{m:02d}{d:02d}")
+            "year": dp.year, "month": dp.month, "day": dp.day,
+            "sum_all_digits": dp.digit_sum
         }
         # Name sums
-        v_letters, c_letters = letters_of(inp.full_name, rules)
-        all_letters = letters_all(inp.full_name, rules)
-        v_sum = sum_letters(v_letters, rules)
-        c_sum = sum_letters(c_letters, rules)
-        all_sum = sum_letters(all_letters, rules)
         raw["name"] = {
-            "vowels_sum": v_sum,
-            "consonants_sum": c_sum,
-            "all_sum": all_sum,
-            "vowels_letters": v_letters,
-            "consonants_letters": c_letters,
-            "all_letters": all_letters
+            "vowels_sum": nm.vowel_sum,
+            "consonants_sum": nm.consonant_sum,
+            "all_sum": nm.total,
+            "vowels_letters": list(nm.vowels),
+            "consonants_letters": list(nm.consonants),
+            "all_letters": list(nm.letters)
         }
         # Key numbers before reduction
-        raw["pre_reduction"] = {
-            "life_path_total": raw["dob"]["sum_all_digits"],
-            "birthday_day": d,
-            "expression_total": all_sum,
-            "soul_urge_total": v_sum,
-            "personality_total": c_sum,
-            "maturity_total": raw["dob"]["sum_all_digits"] + all_sum  # lp (pre-red) + expression (pre-red)
-        }
-        # Pinnacles & challenges raw steps
-        rm = reduce_number(m, rules)  # as per engine logic we use reduced m,d,y to build pinnacles
-        rd = reduce_number(d, rules)
-        ry = reduce_number(y, rules)
-        raw["pinnacles_raw"] = {
-            "rm": rm, "rd": rd, "ry": ry,
-            "p1_raw": rm + rd,
-            "p2_raw": rd + ry,
-            "p3_raw": reduce_number(rm + rd, rules) + reduce_number(rd + ry, rules),
-            "p4_raw": rm + ry,
-            "c1_raw": abs(rm - rd),
-            "c2_raw": abs(rd - ry),
-            "c3_raw": abs(abs(rm - rd) - abs(rd - ry)),
-            "c4_raw": abs(rm - ry)
-        }
-        # Karmic debts detection: where 13/14/16/19 appear before reduction
-        debt_hits = []
-        for label, val in [
-            ("life_path_total", raw["pre_reduction"]["life_path_total"]),
-            ("birthday_day", raw["pre_reduction"]["birthday_day"]),
-            ("expression_total", raw["pre_reduction"]["expression_total"]),
-            ("soul_urge_total", raw["pre_reduction"]["soul_urge_total"]),
-            ("personality_total", raw["pre_reduction"]["personality_total"]),
-            ("maturity_total", raw["pre_reduction"]["maturity_total"]),
-            ("p1_raw", raw["pinnacles_raw"]["p1_raw"]),
-            ("p2_raw", raw["pinnacles_raw"]["p2_raw"]),
-            ("p3_raw", raw["pinnacles_raw"]["p3_raw"]),
-            ("p4_raw", raw["pinnacles_raw"]["p4_raw"]),
-            ("c1_raw", raw["pinnacles_raw"]["c1_raw"]),
-            ("c2_raw", raw["pinnacles_raw"]["c2_raw"]),
-            ("c3_raw", raw["pinnacles_raw"]["c3_raw"]),
-            ("c4_raw", raw["pinnacles_raw"]["c4_raw"]),
-        ]:
-            if val in TRACE_DEBTS:
-                debt_hits.append({"where": label, "value": val})
-        raw["karmic_debt_hits"] = debt_hits
-        report["trace"] = raw
-    else:
-        report["trace"] = {"enabled": False}
-
-    report["disclaimer"] = (
-        "Numerology is not science. Treat this as entertainment and reflective prompts, not factual claims. "
-        "We do not use gender in calculations unless a system explicitly defines it."
-    )
-    return report
+        raw["pre_reduction"] = {k: totals[k] for k in _RAW_LABELS[:6]}
+        # Pinnacles & challenges raw steps (built from reduced m, d, y)
+        raw["pinnacles_raw"] = {"rm": dp.rm, "rd": dp.rd, "ry": dp.ry, **{k: totals[k] for k in _RAW_LABELS[6:]}}
+        raw["karmic_debt_hits"] = ev["karmic_debt_hits"]
+        return AnalysisResult.from_evaluation(ev, fields, raw)
+    return AnalysisResult.from_evaluation(ev, fields)
+
+def analyze_batch(names, dobs, system="pythagorean", target_year=None):
+    # Columnar NumPy engine for large cohorts; numpy is only needed when this is used
+    from .batch import analyze_batch as _analyze_batch
+    return _analyze_batch(names, dobs, system, target_year)
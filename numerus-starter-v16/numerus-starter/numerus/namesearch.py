@@ -0,0 +1,115 @@
+from __future__ import annotations
+import heapq, itertools
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+from .rules import SystemRules
+
+# Target-number name search: which combinations of candidate name parts give
+# the wanted expression / soul urge / personality? Every number reduces a sum,
+# and reduction (classic or digital root, masters included) preserves the sum
+# mod 9, so a combination can only match when its vowel and consonant sums
+# fall in the right residues. Candidates of the largest slot are bucketed by
+# (vowel sum % 9, consonant sum % 9); each prefix of the other slots then
+# visits only the buckets whose residues can complete it, and the exact
+# reduction is checked on those few.
+
+TARGETS = ("expression", "soul_urge", "personality")
+MAX_COMBINATIONS = 5_000_000
+
+class _Candidate(NamedTuple):
+    text: str
+    rank: int       # position in its slot: earlier candidates are preferred
+    vowel_sum: int
+    consonant_sum: int
+
+def _candidates(texts: Sequence[str], rules: SystemRules) -> List[_Candidate]:
+    out, seen = [], set()
+    for text in texts:
+        text = " ".join(text.split())
+        if text in seen:
+            continue
+        seen.add(text)
+        parts = rules.codec.tokens(text)
+        out.append(_Candidate(text, len(out), sum(p[3] for p in parts), sum(p[4] for p in parts)))
+    return out
+
+def _compatible(pv: int, pc: int, residues: Mapping[str, int]) -> List[Tuple[int, int]]:
+    # Residue buckets (bv, bc) that complete a prefix with residues (pv, pc)
+    out = []
+    for bv in range(9):
+        for bc in range(9):
+            if "soul_urge" in residues and (pv + bv) % 9 != residues["soul_urge"]:
+                continue
+            if "personality" in residues and (pc + bc) % 9 != residues["personality"]:
+                continue
+            if "expression" in residues and (pv + pc + bv + bc) % 9 != residues["expression"]:
+                continue
+            out.append((bv, bc))
+    return out
+
+def search_names(rules: SystemRules, slots: Sequence[Sequence[str]], targets: Mapping[str, int],
+                 limit: int = 50, offset: int = 0) -> Dict:
+    """Combinations of one candidate per slot (slots in display order; "" = leave the slot out)
+    whose numbers equal every target, ranked by candidate preference and paginated."""
+    if not targets:
+        raise ValueError(f"at least one target is required: {', '.join(TARGETS)}")
+    unknown = sorted(set(targets) - set(TARGETS))
+    if unknown:
+        raise ValueError(f"Unknown targets: {', '.join(unknown)}")
+    cands = [_candidates(slot, rules) for slot in slots]
+    if not cands or any(not c for c in cands):
+        raise ValueError("every name slot needs at least one candidate")
+    combinations = 1
+    for c in cands:
+        combinations *= len(c)
+    if combinations > MAX_COMBINATIONS:
+        raise ValueError(f"too many combinations ({combinations}); at most {MAX_COMBINATIONS}")
+
+    red = rules.reducer
+    residues = {k: t % 9 for k, t in targets.items()}
+    pivot = max(range(len(cands)), key=lambda i: len(cands[i]))
+    buckets: Dict[Tuple[int, int], List[_Candidate]] = {}
+    for cand in cands[pivot]:
+        buckets.setdefault((cand.vowel_sum % 9, cand.consonant_sum % 9), []).append(cand)
+    others = cands[:pivot] + cands[pivot + 1:]
+    compat: Dict[Tuple[int, int], List[List[_Candidate]]] = {}
+
+    # Only the best offset + limit matches are kept (a bounded heap of negated
+    # ranking keys, worst on top); the rest are just counted
+    keep = offset + limit
+    best: List[tuple] = []
+    total = examined = 0
+    for prefix in itertools.product(*others):
+        pv = sum(c.vowel_sum for c in prefix)
+        pc = sum(c.consonant_sum for c in prefix)
+        key = (pv % 9, pc % 9)
+        lists = compat.get(key)
+        if lists is None:
+            lists = compat[key] = [buckets[b] for b in _compatible(*key, residues) if b in buckets]
+        for bucket in lists:
+            for cand in bucket:
+                examined += 1
+                v, c = pv + cand.vowel_sum, pc + cand.consonant_sum
+                numbers = {"expression": red(v + c), "soul_urge": red(v), "personality": red(c)}
+                if all(numbers[k] == t for k, t in targets.items()):
+                    total += 1
+                    parts = prefix[:pivot] + (cand,) + prefix[pivot:]
+                    ranks = tuple(-p.rank for p in parts)
+                    item = (sum(ranks), ranks, parts, numbers)
+                    if len(best) < keep:
+                        heapq.heappush(best, item)
+                    elif keep and item[:2] > best[0][:2]:
+                        heapq.heapreplace(best, item)
+    best.sort(key=lambda m: m[:2], reverse=True)
+
+    return {
+        "system": rules.name,
+        "targets": dict(targets),
+        "total": total,
+        "combinations": combinations,
+        "examined": examined,
+        "results": [
+            {"full_name": " ".join(p.text for p in parts if p.text), **numbers}
+            for _, _, parts, numbers in best[offset:]
+        ],
+    }
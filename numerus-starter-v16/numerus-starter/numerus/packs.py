@@ -0,0 +1,207 @@
+from __future__ import annotations
+import json, os
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Content packs behind depth=expert|expert_max: loaded and validated once,
+# then compiled into lookup tables. The expert pack's life-path entries are
+# pre-merged with every expression overlay and lp×ex bridge, so an expert
+# block is a table lookup plus the role tweak; year and pinnacle details are
+# plain dicts keyed by number.
+
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), "content")
+EXPERT_PACKS = ("expert-pack-vi-pro.json", "expert-pack-vi.json")  # first found wins
+PERSONAL_YEARS_PACK = os.path.join("cycles", "personal_years_vi.json")
+PINNACLES_PACK = os.path.join("cycles", "pinnacles_vi.json")
+
+_LIST_FIELDS = ("strengths", "blindspots", "habits", "expert_questions")
+
+class ExpertProfile(NamedTuple):
+    theme: str
+    strengths: Tuple[str, ...]
+    blindspots: Tuple[str, ...]
+    habits: Tuple[str, ...]
+    if_then: Tuple[str, ...]
+    questions: Tuple[str, ...]
+
+class ExpertPack:
+    __slots__ = ("source", "life_path", "bridges", "roles", "if_then", "disclaimer", "profiles")
+
+    def __init__(self, source: str, pack: Dict):
+        _validate_expert(source, pack)
+        self.source = source
+        self.life_path: Dict[int, Dict] = {int(k): v for k, v in pack.get("life_path", {}).items()}
+        self.bridges: Dict[Tuple[int, int], str] = {
+            tuple(map(int, k.split("x"))): v for k, v in pack.get("bridges", {}).items()}
+        self.roles: Dict[str, Dict] = pack.get("roles", {})
+        if_then = pack.get("if_then", {})
+        self.if_then = (if_then.get("overwhelm", ""), if_then.get("scatter", ""))
+        self.disclaimer: str = pack.get("voice", {}).get("disclaimer", "")
+        self.profiles: Dict[Tuple[int, int], ExpertProfile] = {
+            (lp, ex): self._merge(lp, ex) for lp in self.life_path for ex in self.life_path}
+
+    def _merge(self, lp, ex) -> ExpertProfile:
+        # Life-path entry overlaid with the expression entry (order kept, duplicates dropped)
+        base, overlay = self.life_path.get(lp, {}), self.life_path.get(ex, {})
+        merged = {f: tuple(x for x in dict.fromkeys(base.get(f, []) + overlay.get(f, [])) if x)
+                  for f in ("strengths", "blindspots", "habits")}
+        if_then = list(self.if_then)
+        if lp and ex and (lp, ex) in self.bridges:
+            if_then.append("Bridge: " + self.bridges[(lp, ex)])
+        return ExpertProfile(base.get("theme", ""), merged["strengths"], merged["blindspots"], merged["habits"],
+                             tuple(x for x in if_then if x), tuple(base.get("expert_questions", [])))
+
+    def profile(self, lp, ex) -> ExpertProfile:
+        p = self.profiles.get((lp, ex))
+        return p if p is not None else self._merge(lp, ex)
+
+    def block(self, lp, ex, py, role_key: Optional[str]) -> Dict:
+        p = self.profile(lp, ex)
+        role_pack = self.roles.get(role_key, {}) if role_key else {}
+        habits = p.habits
+        if role_pack.get("micro"):
+            habits = habits[:3] + tuple(x for x in role_pack["micro"] if x)
+        return {
+            "summary": f"Số đường đời {lp} — {p.theme}. Biểu đạt {ex}; năm cá nhân {py}.",
+            "strengths": list(p.strengths),
+            "blindspots": list(p.blindspots),
+            "habits": list(habits[:7]),
+            "if_then": list(p.if_then),
+            "questions": list(p.questions),
+            "warnings": [self.disclaimer],
+            "role_hint": role_pack.get("lp_ex_hint"),
+        }
+
+class CyclesPack:
+    __slots__ = ("years", "pinnacles")
+
+    def __init__(self, years: Dict, pinnacles: Dict):
+        for source, pack in ((PERSONAL_YEARS_PACK, years), (PINNACLES_PACK, pinnacles)):
+            _check(source, isinstance(pack, dict) and all(isinstance(v, dict) for v in pack.values()),
+                   "must map numbers to objects")
+            _check(source, all(k.isdigit() for k in pack), "keys must be numbers")
+        _check(PERSONAL_YEARS_PACK, all(isinstance(v.get("next_year", {}), dict) for v in years.values()),
+               "next_year must be an object")
+        self.years: Dict[int, Dict] = {int(k): v for k, v in years.items()}
+        self.pinnacles: Dict[int, Dict] = {int(k): v for k, v in pinnacles.items()}
+
+    def years_detail(self, py) -> Dict:
+        cur = self.years.get(py) if isinstance(py, int) else None
+        nxt_py = py % 9 + 1 if isinstance(py, int) and py >= 1 else None
+        current = None
+        if cur is not None:
+            current = {
+                "year": py,
+                "theme": cur.get("theme"),
+                "strengths": cur.get("strengths", []),
+                "pitfalls": cur.get("pitfalls", []),
+                "habits": cur.get("habits", []),
+                "metrics": cur.get("metrics", []),
+            }
+        nxt = self.years.get(nxt_py) if nxt_py else None
+        following = None
+        if nxt is not None:
+            bridge = cur.get("next_year", {}) if cur is not None else {}
+            following = {
+                "year": nxt_py,
+                "theme": nxt.get("theme"),
+                "bridge": bridge.get("bridge") if cur is not None else None,
+                "caution": bridge.get("caution") if cur is not None else None,
+                "habits": nxt.get("habits", [])[:3],
+            }
+        return {"current": current, "next": following}
+
+    def pinnacle_detail(self, stages: List[Dict]) -> Optional[Dict]:
+        # The first stage: reports are shared by everyone with the same numbers,
+        # so the person's current age is not known here
+        if not stages:
+            return None
+        chosen = stages[0]
+        num = chosen.get("number")
+        more = self.pinnacles.get(num, {})
+        return {
+            "index": chosen.get("index"),
+            "number": num,
+            "age_from": chosen.get("age_from"),
+            "age_to": chosen.get("age_to"),
+            "challenge": chosen.get("challenge"),
+            "theme": more.get("theme"),
+            "strengths": more.get("strengths", []),
+            "pitfalls": more.get("pitfalls", []),
+            "practices_3_6m": more.get("practices_3_6m", []),
+            "questions": more.get("questions", []),
+        }
+
+def _check(source: str, ok: bool, problem: str) -> None:
+    if not ok:
+        raise ValueError(f"Invalid content pack {source}: {problem}")
+
+def _strings(value) -> bool:
+    return isinstance(value, list) and all(isinstance(x, str) for x in value)
+
+def _validate_expert(source: str, pack: Dict) -> None:
+    _check(source, isinstance(pack, dict), "must be an object")
+    life_path = pack.get("life_path", {})
+    _check(source, isinstance(life_path, dict) and all(k.isdigit() for k in life_path), "life_path keys must be numbers")
+    for k, entry in life_path.items():
+        _check(source, isinstance(entry, dict), f"life_path.{k} must be an object")
+        _check(source, isinstance(entry.get("theme", ""), str), f"life_path.{k}.theme must be a string")
+        for f in _LIST_FIELDS:
+            _check(source, _strings(entry.get(f, [])), f"life_path.{k}.{f} must be a list of strings")
+    bridges = pack.get("bridges", {})
+    _check(source, isinstance(bridges, dict), "bridges must be an object")
+    for k, v in bridges.items():
+        a, _, b = k.partition("x")
+        _check(source, a.isdigit() and b.isdigit(), f"bridge key {k!r} must look like 1x7")
+        _check(source, isinstance(v, str), f"bridges.{k} must be a string")
+    roles = pack.get("roles", {})
+    _check(source, isinstance(roles, dict), "roles must be an object")
+    for k, role in roles.items():
+        _check(source, isinstance(role, dict) and _strings(role.get("micro", [])), f"roles.{k}.micro must be a list of strings")
+        _check(source, isinstance(role.get("lp_ex_hint", ""), (str, type(None))), f"roles.{k}.lp_ex_hint must be a string")
+    if_then = pack.get("if_then", {})
+    _check(source, isinstance(if_then, dict) and all(isinstance(v, str) for v in if_then.values()),
+           "if_then must map to strings")
+    voice = pack.get("voice", {})
+    _check(source, isinstance(voice, dict) and isinstance(voice.get("disclaimer", ""), str),
+           "voice.disclaimer must be a string")
+
+def _read(name: str):
+    with open(os.path.join(CONTENT_DIR, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _load_once(load):
+    # Pack loaders run once per process; a failure is cached too (as its message)
+    # and raised again as ValueError, so a broken pack is not re-read per report
+    @lru_cache(maxsize=None)
+    def outcome():
+        try:
+            return load(), None
+        except ValueError as e:
+            return None, str(e)
+        except (OSError, TypeError, AttributeError) as e:
+            return None, f"Invalid content pack: {e}"
+
+    def get():
+        value, error = outcome()
+        if error is not None:
+            raise ValueError(error)
+        return value
+    get.cache_clear = outcome.cache_clear
+    get.__doc__ = load.__doc__
+    return get
+
+@_load_once
+def expert_pack() -> Optional[ExpertPack]:
+    """The compiled expert pack, or None when no pack file is installed."""
+    for fn in EXPERT_PACKS:
+        if os.path.exists(os.path.join(CONTENT_DIR, fn)):
+            return ExpertPack(fn, _read(fn))
+    return None
+
+@_load_once
+def cycles_pack() -> CyclesPack:
+    """Personal-year and pinnacle details (a missing file is an empty table)."""
+    def load(name):
+        return _read(name) if os.path.exists(os.path.join(CONTENT_DIR, name)) else {}
+    return CyclesPack(load(PERSONAL_YEARS_PACK), load(PINNACLES_PACK))
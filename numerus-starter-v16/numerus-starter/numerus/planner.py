@@ -0,0 +1,108 @@
+from __future__ import annotations
+import datetime, hashlib, hmac, os, secrets
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Tuple
+
+from .engine import _digit_sum, date_parts, lookup_date_profile
+from .reduction import Reducer
+from .rules import SystemRules
+
+# Year-ahead planner: personal year/month/day for every day of a date range.
+# A month shares one personal year and one personal month, and its personal
+# days are reduce(personal_month + 1..31) -- a row that depends only on the
+# personal month and the reduction policy. Rows are tabulated once per policy,
+# so a month is produced by slicing a row, and the range is generated month by
+# month: memory stays constant however long the range is.
+
+MAX_DAYS = 366 * 100  # longest range one request may stream
+
+class MonthBlock(NamedTuple):
+    year: int
+    month: int
+    first_day: int                      # day of month of personal_days[0]
+    personal_year: int
+    personal_month: int
+    personal_days: Tuple[int, ...]      # one per day, consecutive from first_day
+
+@lru_cache(maxsize=None)
+def _day_row(reducer: Reducer, pm: int) -> Tuple[int, ...]:
+    # Index = day of month (index 0 unused)
+    return tuple(reducer(pm + d) for d in range(32))
+
+def _month_end(y: int, m: int) -> int:
+    nxt = datetime.date(y + m // 12, m % 12 + 1, 1)
+    return (nxt - datetime.timedelta(days=1)).day
+
+def _parse(value: str, field: str) -> datetime.date:
+    try:
+        return datetime.date(*date_parts(value))
+    except Exception:
+        raise ValueError(f"{field} must be YYYY-MM-DD and valid")
+
+def date_range(start: str, end: str) -> Tuple[datetime.date, datetime.date]:
+    """Validated inclusive range, at most MAX_DAYS long."""
+    first, last = _parse(start, "start"), _parse(end, "end")
+    if last < first:
+        raise ValueError("end must not be before start")
+    if (last - first).days + 1 > MAX_DAYS:
+        raise ValueError(f"date range is limited to {MAX_DAYS} days")
+    return first, last
+
+def iter_months(dob: str, rules: SystemRules, start: datetime.date, end: datetime.date) -> Iterator[MonthBlock]:
+    """Personal numbers for start..end (inclusive), one block per calendar month."""
+    born = _parse(dob, "date_of_birth")
+    red = rules.reducer
+    md = lookup_date_profile(born.year, born.month, born.day, red).md_digit_sum
+    year, month, day = start.year, start.month, start.day
+    py = red(_digit_sum(year) + md)
+    while (year, month) <= (end.year, end.month):
+        last = end.day if (year, month) == (end.year, end.month) else _month_end(year, month)
+        pm = red(py + month)
+        yield MonthBlock(year, month, day, py, pm, _day_row(red, pm)[day:last + 1])
+        day = 1
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+            py = red(_digit_sum(year) + md)
+
+def ndjson(blocks: Iterator[MonthBlock]) -> Iterator[bytes]:
+    """One JSON object per day, one chunk per month."""
+    for b in blocks:
+        head = f'{{"date":"{b.year:04d}-{b.month:02d}-'
+        tail = f',"personal_year":{b.personal_year},"personal_month":{b.personal_month},"personal_day":'
+        yield "".join(f'{head}{day:02d}"{tail}{pd}}}\n'
+                      for day, pd in enumerate(b.personal_days, b.first_day)).encode("ascii")
+
+def ics(blocks: Iterator[MonthBlock], dob: str, rules: SystemRules,
+        now: datetime.datetime | None = None) -> Iterator[bytes]:
+    """RFC 5545 calendar with one all-day event per day, one chunk per month."""
+    stamp = (now or datetime.datetime.now(datetime.timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    uid = _calendar_uid(dob, rules)
+    yield ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Numerus//Personal days//EN\r\n"
+           f"CALSCALE:GREGORIAN\r\nX-WR-CALNAME:{_ics_text(f'Personal days ({rules.name})')}\r\n").encode("utf-8")
+    for b in blocks:
+        desc = f"Personal year {b.personal_year}\\, personal month {b.personal_month}"
+        out = []
+        for day, pd in enumerate(b.personal_days, b.first_day):
+            on = datetime.date(b.year, b.month, day)
+            # A DATE start without DTEND lasts one day (RFC 5545 3.6.1): used for
+            # 9999-12-31, whose next day does not exist
+            dtend = f"DTEND;VALUE=DATE:{on + datetime.timedelta(days=1):%Y%m%d}\r\n" if on < datetime.date.max else ""
+            out.append(
+                f"BEGIN:VEVENT\r\nUID:{on:%Y%m%d}-{uid}@numerus\r\nDTSTAMP:{stamp}\r\n"
+                f"DTSTART;VALUE=DATE:{on:%Y%m%d}\r\n{dtend}"
+                f"SUMMARY:Personal day {pd}\r\nDESCRIPTION:{desc}\r\nTRANSP:TRANSPARENT\r\nEND:VEVENT\r\n")
+        yield "".join(out).encode("utf-8")
+    yield b"END:VCALENDAR\r\n"
+
+def _calendar_uid(dob: str, rules: SystemRules) -> str:
+    # Birth dates are few enough to brute-force a plain hash, so the UID is an
+    # HMAC under CALENDAR_UID_SECRET: stable per (dob, system), letting re-imports
+    # update events instead of duplicating them. Without a secret it is random.
+    secret = os.getenv("CALENDAR_UID_SECRET", "").encode("utf-8")
+    if not secret:
+        return secrets.token_hex(16)
+    return hmac.new(secret, f"{dob}|{rules.name}".encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+def _ics_text(s: str) -> str:
+    return s.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
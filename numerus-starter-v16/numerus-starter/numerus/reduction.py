@@ -0,0 +1,70 @@
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+# Sums below this bound are answered from a precomputed table; larger sums
+# (long gematria/abjad names) are digit-folded arithmetically first.
+DEFAULT_TABLE_BOUND = 10000
+
+REDUCE_METHODS = ("classic", "digital_root")
+
+def _digit_sum(n: int) -> int:
+    s = 0
+    while n:
+        n, r = divmod(n, 10)
+        s += r
+    return s
+
+def _classic(n: int, masters: FrozenSet[int]) -> int:
+    # Sum digits until 1-9, stopping at any master number met on the way
+    while n >= 10 and n not in masters:
+        n = _digit_sum(n)
+    return n
+
+def _digital_root(n: int, masters: FrozenSet[int]) -> int:
+    # Arithmetic digital root; only the starting value may be kept as a master
+    if n < 10 or n in masters:
+        return n
+    return 1 + (n - 1) % 9
+
+class Reducer:
+    """Master-aware number reduction for one (method, masters, keep) policy.
+
+    Call it like a function: ``reducer(n)``. Instances are shared between
+    systems with the same policy (see ``get_reducer``).
+    """
+    __slots__ = ("policy", "bound", "_table", "_fold")
+
+    def __init__(self, method: str, masters: FrozenSet[int], bound: int = DEFAULT_TABLE_BOUND):
+        if method not in REDUCE_METHODS:
+            raise ValueError(f"Unknown reduce_method: {method}")
+        bound = max(bound, max(masters, default=0) + 1, 10)
+        fn = _classic if method == "classic" else _digital_root
+        values = [fn(n, masters) for n in range(bound)]
+        self.policy: Tuple[str, FrozenSet[int]] = (method, masters)
+        self.bound = bound
+        self._table = bytes(values) if max(values) < 256 else array("I", values)
+        self._fold = method == "classic"
+
+    def __call__(self, n: int) -> int:
+        if 0 <= n < self.bound:
+            return self._table[n]
+        if n < 0:
+            return n
+        if self._fold:
+            # n >= bound is never a master, so classic reduction continues from its digit sum
+            while n >= self.bound:
+                n = _digit_sum(n)
+            return self._table[n]
+        return 1 + (n - 1) % 9
+
+@lru_cache(maxsize=None)
+def get_reducer(method: str, masters: FrozenSet[int], bound: int = DEFAULT_TABLE_BOUND) -> Reducer:
+    return Reducer(method, masters, bound)
+
+def reducer_for(method: str, master_numbers, keep_master: bool, reduce_master: bool,
+                bound: int = DEFAULT_TABLE_BOUND) -> Reducer:
+    # Masters survive reduction only when kept and not explicitly reduced
+    masters = frozenset(master_numbers) if keep_master and not reduce_master else frozenset()
+    return get_reducer(method, masters, bound)
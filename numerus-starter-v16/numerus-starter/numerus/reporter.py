@@ -1,8 +1,15 @@
 
 from __future__ import annotations
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import itertools
 import os
 import json
+import threading
+import time
+from types import MappingProxyType
+
+from . import packs
+from .cache import ResultCache
 
 # ===== CẢNH BÁO =====
 # Nội dung dưới đây là diễn giải tham khảo bằng tiếng Việt.
@@ -31,7 +38,7 @@ def _brief(n: int) -> Dict:
 def _para(title: str, body: str) -> str:
     return f"**{title}.** {body}"
 
-def describe_life_path(n: int) -> str:
+def _render_life_path(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Đường đời (Life Path). "
@@ -41,7 +48,7 @@ def describe_life_path(n: int) -> str:
         f"{_para('Gợi ý thực hành', b['advice'])}"
     )
 
-def describe_expression(n: int) -> str:
+def _render_expression(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Biểu đạt/Định mệnh (Expression/Destiny). "
@@ -51,7 +58,7 @@ def describe_expression(n: int) -> str:
         f"{_para('Cần tránh', b['minus'])}"
     )
 
-def describe_soul_urge(n: int) -> str:
+def _render_soul_urge(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Nội tâm/Khát tâm (Soul Urge/Heart's Desire). "
@@ -60,7 +67,7 @@ def describe_soul_urge(n: int) -> str:
         f"{_para('Khi lệch pha', b['minus'])}"
     )
 
-def describe_personality(n: int) -> str:
+def _render_personality(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Ấn tượng bên ngoài (Personality). "
@@ -69,7 +76,7 @@ def describe_personality(n: int) -> str:
         f"{_para('Dễ hiểu nhầm', b['minus'])}"
     )
 
-def describe_birthday(n: int) -> str:
+def _render_birthday(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Con số Ngày sinh. "
@@ -78,7 +85,7 @@ def describe_birthday(n: int) -> str:
         f"{_para('Lạm dụng quà tặng', b['minus'])}"
     )
 
-def describe_maturity(n: int) -> str:
+def _render_maturity(n: int) -> str:
     b = _brief(n)
     return (
         f"{b['ten']} – Trưởng thành (Maturity). "
@@ -99,9 +106,18 @@ _PERSONAL_YEAR = {
     9:"Kết thúc, thu hoạch, buông, chữa lành. Dọn chỗ cho chu kỳ mới."
 }
 
-def describe_personal_year(n: int) -> str:
+def _render_personal_year(n: int) -> str:
     return f"Năm cá nhân {n}. {_PERSONAL_YEAR.get(n, '')}"
 
+def _render_pinnacle_theme(n: int) -> str:
+    b = _brief(n)
+    return f"Chủ đề: {', '.join(b['keywords'])}. Thế mạnh: {b['plus']} Cạm bẫy: {b['minus']}"
+
+def _render_challenge(key: Tuple[int, int]) -> str:
+    idx, c = key
+    b = _brief(c)
+    return f"Thử thách {idx} – số {c}: luyện bài {', '.join(b['keywords'])}. Bẫy: {b['minus']}"
+
 def describe_pinnacles(pinnacles: List[int], ages: List[int]) -> List[Dict]:
     buckets = []
     # 4 đợt: [0..a1], [a1..a2], [a2..a3], [a3..]
@@ -112,20 +128,14 @@ def describe_pinnacles(pinnacles: List[int], ages: List[int]) -> List[Dict]:
         ("Giai đoạn 4", ages[2], ages[3]),
     ]
     for i, p in enumerate(pinnacles):
-        b = _brief(p)
         title, start, end = spans[i]
-        theme = f"Chủ đề: {', '.join(b['keywords'])}. Thế mạnh: {b['plus']} Cạm bẫy: {b['minus']}"
         buckets.append({
-            "index": i+1, "number": p, "title": title, "age_from": start, "age_to": end, "theme": theme
+            "index": i+1, "number": p, "title": title, "age_from": start, "age_to": end, "theme": _fragment("pinnacle_theme", p)
         })
     return buckets
 
 def describe_challenges(challenges: List[int]) -> List[str]:
-    res = []
-    for idx, c in enumerate(challenges, 1):
-        b = _brief(c)
-        res.append(f"Thử thách {idx} – số {c}: luyện bài {', '.join(b['keywords'])}. Bẫy: {b['minus']}")
-    return res
+    return [_fragment("challenge", (idx, c)) for idx, c in enumerate(challenges, 1)]
 
 # Karmic lessons – thiếu sóng năng lượng 1..9 trong tên
 _LESSON = {
@@ -143,7 +153,7 @@ _LESSON = {
 def describe_karmic_lessons(less: List[int]) -> List[str]:
     if not less:
         return ["Không có Karmic Lesson thiếu rõ rệt từ tên (1–9 đều hiện diện)."]
-    return [f"Thiếu {n}: {_LESSON[n]}" for n in less if n in _LESSON]
+    return [_fragment("karmic_lesson", n) for n in less if n in _LESSON]
 
 # Karmic debts – 13/14/16/19 (mang tính truyền thống)
 _DEBT = {
@@ -154,7 +164,7 @@ _DEBT = {
 }
 
 def describe_karmic_debts() -> List[str]:
-    return [v for _, v in _DEBT.items()]
+    return list(_DEBT.values())
 
 
 
@@ -171,10 +181,8 @@ def enrich_pinnacles_detail(items: List[Dict]) -> List[Dict]:
     # Add short suggestions per pinnacle number from base dictionary
     out = []
     for it in items:
-        n = it.get("number")
-        b = _brief(n)
         it2 = dict(it)
-        it2["theme"] = { "keywords": b["keywords"], "strength": b["plus"], "pitfall": b["minus"], "advice": b["advice"] }
+        it2["theme"] = dict(_fragment("pinnacle_detail", it.get("number")))  # not the shared fragment
         out.append(it2)
     return out
 
@@ -188,19 +196,93 @@ def describe_lo_shu(grid: Dict[str,int]) -> Dict:
         "Tâm (2–5–8)": sum(grid.get(k,0) for k in ["2","5","8"]),
         "Trí (3–6–9)": sum(grid.get(k,0) for k in ["3","6","9"]),
     }
-    for k in map(str, range(1,10)):
-        cnt = grid.get(k, 0)
-        if cnt == 0:
-            explain_each[k] = f"Thiếu {k}: năng lượng này cần luyện chủ động."
-        elif cnt == 1:
-            explain_each[k] = f"Có {k} (1 lần): khuynh hướng tự nhiên vừa đủ."
-        elif cnt == 2:
-            explain_each[k] = f"{k} (2 lần): năng lượng nổi trội – dùng có ý thức."
-        else:
-            explain_each[k] = f"{k} (>=3): dồi dào – coi chừng lệch; cần kênh xả lành mạnh."
-    notes.append("Lo Shu chỉ là lược đồ đếm con số ngày sinh – tính biểu tượng, không khoa học.")
+    for k in _LO_SHU_DIGITS:
+        explain_each[k] = _fragment("lo_shu", (k, min(grid.get(k, 0), 3)))
+    notes.append(_LO_SHU_NOTE)
     return {"each": explain_each, "planes": planes, "notes": notes}
 
+_LO_SHU_DIGITS = tuple(map(str, range(1, 10)))
+_LO_SHU_NOTE = "Lo Shu chỉ là lược đồ đếm con số ngày sinh – tính biểu tượng, không khoa học."
+
+def _render_lo_shu(key: Tuple[str, int]) -> str:
+    k, cnt = key
+    if cnt <= 0:
+        return f"Thiếu {k}: năng lượng này cần luyện chủ động."
+    if cnt == 1:
+        return f"Có {k} (1 lần): khuynh hướng tự nhiên vừa đủ."
+    if cnt == 2:
+        return f"{k} (2 lần): năng lượng nổi trội – dùng có ý thức."
+    return f"{k} (>=3): dồi dào – coi chừng lệch; cần kênh xả lành mạnh."
+
+def _render_karmic_lesson(n: int) -> str:
+    return f"Thiếu {n}: {_LESSON[n]}"
+
+def _render_pinnacle_detail(n) -> Dict:
+    b = _brief(n)
+    return {"keywords": b["keywords"], "strength": b["plus"], "pitfall": b["minus"], "advice": b["advice"]}
+
+# ---- Narrative fragment tables ----
+# Every narrative fragment is a pure function of its number(s), so each
+# (locale, section, key) is rendered once at import; describe_* and compose()
+# only look fragments up. Keys outside the tables (numbers some exotic system
+# produces) are rendered on demand. Dict fragments are shared: treat as read-only.
+
+_NUMBERS = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22, 33)
+
+_RENDERERS = {
+    "vi": {
+        "life_path": (_render_life_path, _NUMBERS),
+        "expression": (_render_expression, _NUMBERS),
+        "soul_urge": (_render_soul_urge, _NUMBERS),
+        "personality": (_render_personality, _NUMBERS),
+        "birthday": (_render_birthday, _NUMBERS),
+        "maturity": (_render_maturity, _NUMBERS),
+        "personal_year": (_render_personal_year, _NUMBERS),
+        "pinnacle_theme": (_render_pinnacle_theme, _NUMBERS),
+        "pinnacle_detail": (_render_pinnacle_detail, _NUMBERS),
+        "challenge": (_render_challenge, tuple(itertools.product(range(1, 5), _NUMBERS))),
+        "karmic_lesson": (_render_karmic_lesson, tuple(_LESSON)),
+        "lo_shu": (_render_lo_shu, tuple(itertools.product(_LO_SHU_DIGITS, range(4)))),
+    },
+}
+_DEFAULT_LOCALE = "vi"
+
+def _compile_fragments() -> Dict[str, Dict[str, MappingProxyType]]:
+    return {
+        locale: {section: MappingProxyType({key: render(key) for key in keys})
+                 for section, (render, keys) in sections.items()}
+        for locale, sections in _RENDERERS.items()
+    }
+
+FRAGMENTS = _compile_fragments()
+
+def _fragment(section: str, key, locale: str = _DEFAULT_LOCALE):
+    if locale not in FRAGMENTS:
+        locale = _DEFAULT_LOCALE
+    text = FRAGMENTS[locale][section].get(key)
+    return text if text is not None else _RENDERERS[locale][section][0](key)
+
+def describe_life_path(n: int) -> str:
+    return _fragment("life_path", n)
+
+def describe_expression(n: int) -> str:
+    return _fragment("expression", n)
+
+def describe_soul_urge(n: int) -> str:
+    return _fragment("soul_urge", n)
+
+def describe_personality(n: int) -> str:
+    return _fragment("personality", n)
+
+def describe_birthday(n: int) -> str:
+    return _fragment("birthday", n)
+
+def describe_maturity(n: int) -> str:
+    return _fragment("maturity", n)
+
+def describe_personal_year(n: int) -> str:
+    return _fragment("personal_year", n)
+
 
 
 
@@ -227,66 +309,217 @@ def _score_rule(rule: dict) -> int:
     return s
 
 
-def _load_context_rules() -> list:
-    import json, os
-    path = os.path.join(os.path.dirname(__file__), "context_rules.json")
+_CONTEXT_RULES_PATH = os.path.join(os.path.dirname(__file__), "context_rules.json")
+_CONTEXT_KEYS = ("lp", "ex", "su", "pe")
+
+def _load_context_rules(path: str = _CONTEXT_RULES_PATH) -> list:
     if not os.path.exists(path):
         return []
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _rule_roles(rule: dict) -> set:
+    roles = rule.get('roles') or ([rule.get('role')] if rule.get('role') else [])
+    return {(_norm_role(x) or '') for x in roles}
+
+class _ContextIndex:
+    """Context rules compiled for selection.
+
+    Rules are ranked once by score (file order within a score, as the stable
+    sort in the linear scan gave). Each rule is filed under its pattern --
+    the keys it constrains -- keyed by the values it accepts, so a selection
+    is one dict lookup per pattern plus a role filter, and sorting the few
+    hit ranks restores the score order.
+    """
+    __slots__ = ("patterns", "by_role", "items")
+
+    def __init__(self, rules: list):
+        order = sorted(range(len(rules)), key=lambda i: _score_rule(rules[i]) + (100 if rules[i].get('signature') else 0),
+                       reverse=True)
+        self.patterns: Dict[Tuple[str, ...], Dict[tuple, List[int]]] = {}
+        self.by_role: Dict[str, set] = {}
+        self.items: List[Tuple] = []
+        for rank, i in enumerate(order):
+            r = rules[i]
+            pattern = tuple(k for k in _CONTEXT_KEYS if r.get(k) is not None)
+            table = self.patterns.setdefault(pattern, {})
+            accepted = [r[k] if isinstance(r[k], list) else [r[k]] for k in pattern]
+            for key in itertools.product(*accepted):
+                ranks = table.setdefault(key, [])
+                if not ranks or ranks[-1] != rank:
+                    ranks.append(rank)
+            for role in _rule_roles(r):
+                self.by_role.setdefault(role, set()).add(rank)
+            self.items.append((r.get('vi'), r.get('habits', []), r.get('role') or r.get('roles', [])))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def select(self, lp, ex, su, pe, role_norm: str | None) -> list:
+        cur = {"lp": lp, "ex": ex, "su": su, "pe": pe}
+        hits: List[int] = []
+        for pattern, table in self.patterns.items():
+            hits += table.get(tuple(cur[k] for k in pattern), ())
+        if role_norm:
+            allowed = self.by_role.get(role_norm, ())
+            hits = [h for h in hits if h in allowed]
+        hits.sort()
+        out = []
+        for h in hits:
+            text, habits, role = self.items[h]
+            out.append({"text": text, "habits": list(habits), "role": list(role) if isinstance(role, list) else role})
+        return out
+
+class _ContextRuleStore:
+    """context_rules.json compiled once; re-stat at most every ``check_interval``
+    seconds and a rebuilt index swapped in when the file changed. A file that
+    fails to load keeps the previous index in service."""
+
+    def __init__(self, path: str = _CONTEXT_RULES_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._index: Optional[_ContextIndex] = None
+        self._sig: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = self.reload_errors = 0
+
+    def get(self) -> _ContextIndex:
+        index = self._index
+        if index is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return index
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> _ContextIndex:
+        try:
+            st = os.stat(self.path)
+            sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = None
+        if self._index is None or sig != self._sig:
+            try:
+                self._index = _ContextIndex(_load_context_rules(self.path) if sig else [])
+                self.loads += 1
+            except Exception:
+                if self._index is None:
+                    raise
+                self.reload_errors += 1
+            self._sig = sig
+        self._checked_at = time.monotonic()
+        return self._index
+
+    def stats(self) -> Dict[str, int]:
+        index = self._index
+        return {"rules": len(index) if index is not None else 0, "loads": self.loads, "reload_errors": self.reload_errors}
+
+CONTEXT_RULES = _ContextRuleStore(check_interval=float(os.getenv("RULES_CHECK_INTERVAL", "1.0")))
+
 def _select_context(numerics: Dict, role: str | None = None) -> list:
-    rules = _load_context_rules()
     lp = numerics.get('life_path'); ex = numerics.get('expression'); su = numerics.get('soul_urge'); pe = numerics.get('personality')
-    role_norm = _norm_role(role)
-    def _role_ok(r):
-        roles = r.get('roles') or ([r.get('role')] if r.get('role') else [])
-        roles = [(_norm_role(x) or '') for x in roles]
-        return (not role_norm) or (role_norm in roles)
-    cand = [r for r in rules if _match_rule(r, lp, ex, su, pe) and _role_ok(r)]
-    # sort: signature + role match highest
-    def _score(r):
-        base = _score_rule(r)
-        if r.get('signature'): base += 100
-        if role_norm and ((r.get('roles') and role_norm in [(_norm_role(x) or '') for x in r['roles']]) or (_norm_role(r.get('role')) == role_norm)):
-            base += 50
-        return base
-    cand.sort(key=_score, reverse=True)
-    out = []
-    for r in cand:
-        out.append({"text": r.get('vi'), "habits": r.get('habits', []), "role": r.get('role') or r.get('roles', [])})
-    return out
-
+    return CONTEXT_RULES.get().select(lp, ex, su, pe, _norm_role(role))
+
+
+_ROLE_ALIASES = {
+    'pm':'product_manager', 'product':'product_manager', 'product owner':'product_manager',
+    'swe':'software_engineer','developer':'software_engineer','engineer':'software_engineer',
+    'ds':'data_scientist','data':'data_scientist',
+    'founder':'founder','ceo':'ceo','coo':'coo',
+    'hr':'hr_leader','people':'hr_leader',
+    'coach':'coach','consultant':'consultant',
+    'teacher':'teacher','giáo_viên':'teacher','giáo vien':'teacher',
+    'therapist':'therapist','tâm_lý':'therapist','psychotherapist':'therapist',
+    'artist':'artist','writer':'writer','content':'content_creator',
+    'policy':'policy_analyst','analyst':'policy_analyst',
+    'doctor':'doctor','physician':'doctor','bác_sĩ':'doctor','bac si':'doctor',
+    'nurse':'nurse','y_tá':'nurse','y ta':'nurse',
+    'lawyer':'lawyer','luật_sư':'lawyer','luat su':'lawyer',
+    'investor':'investor','vc':'investor','trader':'trader','financial_analyst':'financial_analyst','accountant':'accountant','financial_planner':'financial_planner',
+    'musician':'musician','composer':'composer','filmmaker':'filmmaker','photographer':'photographer',
+    'operations':'operations_manager','ops':'operations_manager','supply_chain':'supply_chain_manager','logistics':'supply_chain_manager',
+    'devops':'devops_engineer','security':'security_engineer','cybersecurity':'security_engineer',
+    'civil_engineer':'civil_engineer','architect':'architect','project_manager':'project_manager','customer_support':'customer_support_lead',
+    'marketing':'marketing_lead','sales':'sales_lead',
+    'designer':'designer','ux':'ux_researcher','researcher':'researcher'
+}
 
 def _norm_role(role: str | None) -> str | None:
     if not role: return None
     r = role.strip().lower().replace(' ', '_')
-    aliases = {
-        'pm':'product_manager', 'product':'product_manager', 'product owner':'product_manager',
-        'swe':'software_engineer','developer':'software_engineer','engineer':'software_engineer',
-        'ds':'data_scientist','data':'data_scientist',
-        'founder':'founder','ceo':'ceo','coo':'coo',
-        'hr':'hr_leader','people':'hr_leader',
-        'coach':'coach','consultant':'consultant',
-        'teacher':'teacher','giáo_viên':'teacher','giáo vien':'teacher',
-        'therapist':'therapist','tâm_lý':'therapist','psychotherapist':'therapist',
-        'artist':'artist','writer':'writer','content':'content_creator',
-        'policy':'policy_analyst','analyst':'policy_analyst',
-        'doctor':'doctor','physician':'doctor','bác_sĩ':'doctor','bac si':'doctor',
-        'nurse':'nurse','y_tá':'nurse','y ta':'nurse',
-        'lawyer':'lawyer','luật_sư':'lawyer','luat su':'lawyer',
-        'investor':'investor','vc':'investor','trader':'trader','financial_analyst':'financial_analyst','accountant':'accountant','financial_planner':'financial_planner',
-        'musician':'musician','composer':'composer','filmmaker':'filmmaker','photographer':'photographer',
-        'operations':'operations_manager','ops':'operations_manager','supply_chain':'supply_chain_manager','logistics':'supply_chain_manager',
-        'devops':'devops_engineer','security':'security_engineer','cybersecurity':'security_engineer',
-        'civil_engineer':'civil_engineer','architect':'architect','project_manager':'project_manager','customer_support':'customer_support_lead',
-        'marketing':'marketing_lead','sales':'sales_lead',
-        'designer':'designer','ux':'ux_researcher','researcher':'researcher'
+    return _ROLE_ALIASES.get(r, r)
+
+# Everything compose() reads from the numbers; the report body is a function of
+# these plus locale, role and depth, so bodies are cached per signature
+_SIGNATURE_FIELDS = ("life_path", "expression", "soul_urge", "personality", "birthday", "maturity",
+                     "pinnacles", "challenges", "transition_ages", "pinnacles_detailed", "personal_year",
+                     "lo_shu", "life_pyramid", "karmic_lessons")
+_MISSING = object()
+
+def _freeze(v):
+    t = type(v)
+    if t is list or t is tuple:
+        return tuple(v) if all(type(x) is int for x in v) else tuple(map(_freeze, v))
+    if t is dict:
+        return tuple(zip(v, map(_freeze, v.values())))
+    return v
+
+def _signature(numerics: Dict, locale: str, role: str | None, depth: str) -> tuple:
+    CONTEXT_RULES.get()  # picks up an edited context_rules.json; loads then keys the new generation
+    return (tuple(_freeze(numerics.get(f, _MISSING)) for f in _SIGNATURE_FIELDS),
+            locale, _norm_role(role), depth, CONTEXT_RULES.loads)
+
+
+def dumps_json(obj) -> bytes:
+    # Same encoding as the API's JSON responses, so fragments can be spliced into them
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+class _CachedReport:
+    # members: the report body (everything but its header) pre-encoded as the
+    # JSON members after "header". Only bytes are cached, so no caller can
+    # mutate what the next one receives.
+    __slots__ = ("members",)
+
+    def __init__(self, body: Dict):
+        self.members = dumps_json(body)[1:-1]
+
+def _report_size(entry: _CachedReport) -> int:
+    return len(entry.members)
+
+REPORT_CACHE = ResultCache(
+    maxsize=int(os.getenv("REPORT_CACHE_SIZE", "4096")),
+    max_bytes=int(os.getenv("REPORT_CACHE_MB", "32")) * 1024 * 1024,
+    sizeof=_report_size,
+)
+
+def _cached_report(numerics: Dict, locale: str, role: str | None, depth: str) -> _CachedReport:
+    # Only the header is per person; the rest is shared by everyone with the same numbers
+    key = _signature(numerics, locale, role, depth)
+    entry = REPORT_CACHE.get(key)
+    if entry is None:
+        entry = _CachedReport(_compose_body(numerics, role, depth))
+        REPORT_CACHE.put(key, entry)
+    return entry
+
+def _header(full_name: str, date_of_birth: str, locale: str, system: str) -> Dict:
+    return {
+        "system": system,
+        "locale": locale,
+        "full_name": full_name,
+        "date_of_birth": date_of_birth
     }
-    return aliases.get(r, r)
 
 def compose(numerics: Dict, full_name: str, date_of_birth: str, locale: str = "vi", system: str = "Pythagorean", role: str | None = None, depth: str = "standard") -> Dict:
     # numerics: output 'numbers' từ engine.analyze
+    # A fresh copy per call: decoded from the cached bytes, never the cached report itself
+    return json.loads(compose_json(numerics, full_name, date_of_birth, locale, system, role, depth))
+
+def compose_json(numerics: Dict, full_name: str, date_of_birth: str, locale: str = "vi", system: str = "Pythagorean", role: str | None = None, depth: str = "standard") -> bytes:
+    """compose() already encoded as JSON: only the header is encoded per call."""
+    entry = _cached_report(numerics, locale, role, depth)
+    header = dumps_json(_header(full_name, date_of_birth, locale, system))
+    return b'{"header":' + header + b"," + entry.members + b"}"
+
+def _compose_body(numerics: Dict, role: str | None, depth: str = "standard") -> Dict:
     lp = numerics.get("life_path")
     ex = numerics.get("expression")
     su = numerics.get("soul_urge")
@@ -300,13 +533,7 @@ def compose(numerics: Dict, full_name: str, date_of_birth: str, locale: str = "v
     grid = numerics.get("lo_shu", {})
     lessons = numerics.get("karmic_lessons", [])
 
-    return {
-        "header": {
-            "system": system,
-            "locale": locale,
-            "full_name": full_name,
-            "date_of_birth": date_of_birth
-        },
+    out = {
         "core": {
             "life_path": describe_life_path(lp) if lp else None,
             "expression": describe_expression(ex) if ex else None,
@@ -331,138 +558,19 @@ def compose(numerics: Dict, full_name: str, date_of_birth: str, locale: str = "v
         },
         "disclaimer": "Diễn giải cho mục đích tự phản tư. Không thay thế tư vấn y khoa/tài chính/pháp lý."
     }
-
-
-def _load_expert_pack() -> dict:
-    base = os.path.join(os.path.dirname(__file__), "content")
-    for fn in ["expert-pack-vi-pro.json", "expert-pack-vi.json"]:
-        p = os.path.join(base, fn)
-        if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-    return {}
-
-    # Expert Max synthesis
-    try:
-        if depth in ("expert","expert_max") and pack:
-            lp = numerics.get("core",{}).get("life_path")
-            ex = numerics.get("core",{}).get("expression")
-            su = numerics.get("core",{}).get("soul_urge")
-            pe = numerics.get("core",{}).get("personality")
-            py = numerics.get("cycles",{}).get("personal_year")
-            lp_block = pack.get("life_path",{}).get(str(lp),{})
-            overlays = {
-                "expression": pack.get("life_path",{}).get(str(ex),{}),
-                "soul_urge": pack.get("life_path",{}).get(str(su),{}),
-                "personality": pack.get("life_path",{}).get(str(pe),{})
-            }
-            bridges = pack.get("bridges",{})
-            roles = pack.get("roles",{})
-            role_key = None
-            if role:
-                role_key = role.lower().replace(" ","_")
-            role_pack = roles.get(role_key, {}) if role_key else {}
-            # Build expert sections
-            summary = f"Số đường đời {lp} — {lp_block.get('theme','')}. Biểu đạt {ex}; năm cá nhân {py}."
-            strengths = list(dict.fromkeys(lp_block.get("strengths",[]) + overlays["expression"].get("strengths",[]) ))
-            blind = list(dict.fromkeys(lp_block.get("blindspots",[]) + overlays["expression"].get("blindspots",[]) ))
-            habits = list(dict.fromkeys(lp_block.get("habits",[]) + overlays["expression"].get("habits",[]) ))
-            if role_pack.get("micro"):
-                habits = habits[:3] + role_pack["micro"]
-            if_then = [pack.get("if_then",{}).get("overwhelm",""), pack.get("if_then",{}).get("scatter","")]
-            if lp and ex:
-                key = f"{lp}x{ex}"
-                if key in bridges: if_then.append("Bridge: " + bridges[key])
-            questions = lp_block.get("expert_questions",[])
-            warnings = [pack.get("voice",{}).get("disclaimer","")]
-            expert = {
-                "summary": summary,
-                "strengths": [x for x in strengths if x],
-                "blindspots": [x for x in blind if x],
-                "habits": [x for x in habits if x][:7],
-                "if_then": [x for x in if_then if x],
-                "questions": questions,
-                "warnings": warnings,
-                "role_hint": role_pack.get("lp_ex_hint")
-            }
-            out["expert"] = expert
-    except Exception as e:
-        out["expert_error"] = str(e)
-
-
-def _load_cycles_pack() -> dict:
-    base = os.path.join(os.path.dirname(__file__), "content", "cycles")
-    out = {}
-    for fn in ["personal_years_vi.json","pinnacles_vi.json"]:
-        p = os.path.join(base, fn)
-        if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    out[fn] = json.load(f)
-            except Exception:
-                out[fn] = {}
+    if depth in ("expert", "expert_max"):
+        # Packs are compiled on first use; a broken pack is reported, not raised
+        try:
+            pack = packs.expert_pack()
+            if pack is not None:
+                out["expert"] = pack.block(lp, ex, py, _norm_role(role))
+        except ValueError as e:
+            out["expert_error"] = str(e)
+    if depth == "expert_max":
+        try:
+            cycles = packs.cycles_pack()
+            out["years_detail"] = cycles.years_detail(py)
+            out["pinnacle_detail"] = cycles.pinnacle_detail(numerics.get("pinnacles_detailed") or [])
+        except ValueError as e:
+            out["years_error"] = str(e)
     return out
-
-
-    # Year & Pinnacle synthesis (expert-grade)
-    try:
-        py_map = cycles.get("personal_years_vi.json", {})
-        pin_map = cycles.get("pinnacles_vi.json", {})
-        cur_py = numerics.get("cycles",{}).get("personal_year")
-        nxt_py = (cur_py % 9) + 1 if isinstance(cur_py,int) and cur_py >=1 else None
-        year_block = None
-        if cur_py and str(cur_py) in py_map:
-            y = py_map[str(cur_py)]
-            year_block = {
-                "year": cur_py,
-                "theme": y.get("theme"),
-                "strengths": y.get("strengths", []),
-                "pitfalls": y.get("pitfalls", []),
-                "habits": y.get("habits", []),
-                "metrics": y.get("metrics", [])
-            }
-        next_block = None
-        if nxt_py and str(nxt_py) in py_map:
-            y2 = py_map[str(nxt_py)]
-            next_block = {
-                "year": nxt_py,
-                "theme": y2.get("theme"),
-                "bridge": py_map[str(cur_py)].get("next_year",{}).get("bridge") if year_block else None,
-                "caution": py_map[str(cur_py)].get("next_year",{}).get("caution") if year_block else None,
-                "habits": y2.get("habits", [])[:3]
-            }
-        # Active pinnacle from numerics, then enrich
-        active_pin = None
-        # numerics may have stages with index, number, age_from, age_to
-        p_list = numerics.get("pinnacles_detailed") or numerics.get("pinnacles") or []
-        # choose one where 'current_age' falls in range if available; else first
-        cur_age = numerics.get("profile",{}).get("age")
-        chosen = None
-        for p in p_list:
-            a1 = p.get("age_from"); a2 = p.get("age_to")
-            if cur_age and a1 is not None and a2 is not None and a1 <= cur_age <= a2:
-                chosen = p; break
-        if not chosen and p_list: chosen = p_list[0]
-        if chosen:
-            num = chosen.get("number")
-            more = pin_map.get(str(num), {})
-            active_pin = {
-                "index": chosen.get("index"),
-                "number": num,
-                "age_from": chosen.get("age_from"),
-                "age_to": chosen.get("age_to"),
-                "challenge": chosen.get("challenge"),
-                "theme": more.get("theme"),
-                "strengths": more.get("strengths", []),
-                "pitfalls": more.get("pitfalls", []),
-                "practices_3_6m": more.get("practices_3_6m", []),
-                "questions": more.get("questions", [])
-            }
-        out["years_detail"] = {"current": year_block, "next": next_block}
-        out["pinnacle_detail"] = active_pin
-    except Exception as e:
-        out["years_error"] = str(e)
-    
\ No newline at end of file
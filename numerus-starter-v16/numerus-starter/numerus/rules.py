@@ -1,47 +1,263 @@
-
 from __future__ import annotations
-import json, os, unicodedata
-from dataclasses import dataclass
-from typing import Dict, List, Set
+import json, os, struct, threading, time, unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from .reduction import DEFAULT_TABLE_BOUND, Reducer, reducer_for
+from .scripts import _DropTable, base_letters, compile_tokenizer, script_for
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "systems")
 
-@dataclass
+# Per-system memo of scored name tokens ("Nguyễn", "Văn", ...); longer tokens are scored uncached
+TOKEN_MEMO_SIZE = int(os.getenv("TOKEN_MEMO_SIZE", "4096"))
+TOKEN_MEMO_MAX_LEN = 32
+
+# (letters, vowels, consonants, vowel sum, consonant sum, packed counts of values 0..9)
+# Counts are packed in 16-bit lanes so token scores combine with a single sum().
+TokenScore = Tuple[str, str, str, int, int, int]
+_LANES = struct.Struct("<10H")
+
+@dataclass(frozen=True)
+class LetterCodec:
+    """Translation tables compiled once per system.
+
+    Value tables map a scored letter to ``chr(value)`` and delete everything
+    else, so ``sum(map(ord, letters.translate(table)))`` scores a name in one
+    C-level pass.
+    """
+    normalization: str
+    script: str                      # tokenizer script selected from char_map (see scripts.py)
+    keep: Dict[int, str]             # accepted spelling -> scored letter(s)
+    vowels: Dict[int, str]           # vowel -> itself
+    consonants: Dict[int, str]       # consonant -> itself
+    values: Dict[int, str]           # scored letter -> chr(value)
+    vowel_values: Dict[int, str]
+    consonant_values: Dict[int, str]
+    fold: Dict[int, str]             # scored letter -> first letter with its value and vowel/consonant class
+    key: tuple                       # everything the tables derive from: equal keys score identically
+    token: Callable[[str], TokenScore] = field(init=False, repr=False, compare=False)  # memoized score()
+
+    def __post_init__(self):
+        object.__setattr__(self, "token", lru_cache(maxsize=TOKEN_MEMO_SIZE)(self.score))
+
+    @staticmethod
+    def compile(rules: "SystemRules") -> "LetterCodec":
+        script = script_for(rules.char_map)
+        keep = compile_tokenizer(script, rules.char_map)
+        vowels, consonants = _DropTable(), _DropTable()
+        values, vowel_values, consonant_values = _DropTable(), _DropTable(), _DropTable()
+        fold, representatives = {}, {}
+        for ch, v in rules.char_map.items():
+            if len(ch) != 1:
+                continue
+            o = ord(ch)
+            values[o] = chr(v)
+            # Toned letters are vowels by their base letter (e.g. Vietnamese "Ầ" -> "A")
+            base = ch if ch in rules.vowels else base_letters(ch)
+            is_vowel = rules.include_y_as_vowel if base == "Y" else base in rules.vowels
+            # Letters only ever contain char_map letters: give every one an explicit
+            # entry (None = delete) so no lookup falls through to __missing__
+            vowels[o], vowel_values[o] = (ch, chr(v)) if is_vowel else (None, None)
+            consonants[o], consonant_values[o] = (None, None) if is_vowel else (ch, chr(v))
+            fold[o] = representatives.setdefault((v, is_vowel), ch)
+        key = (rules.normalization, tuple(sorted(rules.char_map.items())), rules.vowels, rules.include_y_as_vowel)
+        return LetterCodec(rules.normalization, script.name, keep, vowels, consonants,
+                           values, vowel_values, consonant_values, fold, key)
+
+    def letters(self, name: str) -> str:
+        # Scored letters of a raw name, in order; spaces and punctuation dropped
+        return normalize_name(name, self.normalization).upper().translate(self.keep)
+
+    def split(self, letters: str) -> Tuple[str, str]:
+        return letters.translate(self.vowels), letters.translate(self.consonants)
+
+    def total(self, letters: str) -> int:
+        return sum(map(ord, letters.translate(self.values)))
+
+    def sums(self, letters: str) -> Tuple[int, int, int]:
+        # (vowel sum, consonant sum, total)
+        v = sum(map(ord, letters.translate(self.vowel_values)))
+        c = sum(map(ord, letters.translate(self.consonant_values)))
+        return v, c, v + c
+
+    def score(self, text: str) -> TokenScore:
+        return self.score_folded(normalize_name(text, self.normalization).upper())
+
+    def score_folded(self, folded: str) -> TokenScore:
+        # score() of text already normalized with self.normalization and upper-cased
+        letters = folded.translate(self.keep)
+        vowels, consonants = self.split(letters)
+        values = letters.translate(self.values)
+        return (letters, vowels, consonants, self.total(vowels), self.total(consonants),
+                sum(values.count(chr(i)) << 16 * i for i in range(10)))
+
+    def value_counts(self, packed: int, letters: str) -> Tuple[int, ...]:
+        # Unpack summed token counts; a lane can only overflow past 65535 letters
+        if len(letters) < 0x10000:
+            return _LANES.unpack(packed.to_bytes(20, "little"))
+        values = letters.translate(self.values)
+        return tuple(values.count(chr(i)) for i in range(10))
+
+    def tokens(self, name: str) -> List[TokenScore]:
+        # Scores of the whitespace-separated tokens; normalization, case folding and
+        # the letter tables all act per character, so token scores add up to the name's
+        return [self.token(t) if len(t) <= TOKEN_MEMO_MAX_LEN else self.score(t) for t in name.split()]
+
+    def token_stats(self) -> Dict[str, Any]:
+        info = self.token.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate_percent": round(info.hits / lookups * 100, 2) if lookups else 0,
+        }
+
+@dataclass(frozen=True)
 class SystemRules:
+    # Immutable: instances are shared process-wide through the rules registry
     name: str
-    char_map: Dict[str, int]
-    master_numbers: Set[int]
+    char_map: Mapping[str, int]
+    master_numbers: FrozenSet[int]
     reduce_master: bool  # if True, master numbers are also reduced (rare). Default False
     keep_master: bool    # if True, do not reduce master numbers when they appear
-    vowels: Set[str]     # uppercase vowels (policy for 'Y' handled via include_y_as_vowel)
+    vowels: FrozenSet[str]  # uppercase vowels (policy for 'Y' handled via include_y_as_vowel)
     include_y_as_vowel: bool
     normalization: str   # 'ascii' or 'none'
     reduce_method: str   # 'classic' (sum digits until 1-9 unless master), 'digital_root'
+    reduce_table_bound: int = DEFAULT_TABLE_BOUND
+    revision: int = field(default=0, compare=False)  # registry load counter; changes on hot reload
+    codec: LetterCodec = field(init=False, repr=False, compare=False)
+    reducer: Reducer = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "codec", LetterCodec.compile(self))
+        object.__setattr__(self, "reducer", reducer_for(self.reduce_method, self.master_numbers, self.keep_master,
+                                                        self.reduce_master, self.reduce_table_bound))
 
     @staticmethod
     def load(system: str) -> "SystemRules":
+        # Always parses the file; request paths use the shared get_rules() instead
         path = os.path.join(DATA_DIR, f"{system}.json")
         if not os.path.exists(path):
             raise ValueError(f"Unknown system: {system}")
+        return SystemRules.from_file(path)
+
+    @staticmethod
+    def from_file(path: str, revision: int = 0) -> "SystemRules":
         with open(path, "r", encoding="utf-8") as f:
             raw = json.load(f)
         return SystemRules(
             name=raw["name"],
-            char_map={k.upper(): v for k, v in raw["char_map"].items()},
-            master_numbers=set(raw.get("master_numbers", [])),
+            char_map=MappingProxyType({k.upper(): v for k, v in raw["char_map"].items()}),
+            master_numbers=frozenset(raw.get("master_numbers", [])),
             reduce_master=bool(raw.get("reduce_master", False)),
             keep_master=bool(raw.get("keep_master", True)),
-            vowels=set([c.upper() for c in raw.get("vowels", list("AEIOU"))]),
+            vowels=frozenset(c.upper() for c in raw.get("vowels", list("AEIOU"))),
             include_y_as_vowel=bool(raw.get("include_y_as_vowel", True)),
             normalization=raw.get("normalization", "ascii"),
             reduce_method=raw.get("reduce_method", "classic"),
+            reduce_table_bound=int(raw.get("reduce_table_bound", DEFAULT_TABLE_BOUND)),
+            revision=revision,
         )
 
+class RulesRegistry:
+    """Process-wide SystemRules cache with mtime-based hot reload.
+
+    Each system file is parsed once; ``get()`` re-stats it at most every
+    ``check_interval`` seconds and swaps in a freshly built instance when it
+    changed. A file that fails to parse keeps the previous version in service.
+    """
+
+    def __init__(self, directory: str = DATA_DIR, check_interval: float = 1.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._entries: Dict[str, Tuple[SystemRules, Tuple[int, int], float]] = {}  # id -> (rules, (mtime_ns, size), checked_at)
+        self._lock = threading.Lock()
+        self.loads = self.reloads = self.reload_errors = 0
+
+    def loaded(self) -> Dict[str, SystemRules]:
+        return {system: entry[0] for system, entry in list(self._entries.items())}
+
+    def systems(self) -> List[str]:
+        return sorted(fn[:-5] for fn in os.listdir(self.directory) if fn.endswith(".json"))
+
+    def get(self, system: str) -> SystemRules:
+        entry = self._entries.get(system)
+        now = time.monotonic()
+        if entry is not None and now - entry[2] < self.check_interval:
+            return entry[0]
+        with self._lock:
+            return self._refresh(system, self._entries.get(system), now)
+
+    def _refresh(self, system: str, entry: Optional[tuple], now: float) -> SystemRules:
+        if not system or os.path.basename(system) != system or system.startswith("."):
+            raise ValueError(f"Unknown system: {system}")
+        path = os.path.join(self.directory, f"{system}.json")
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._entries.pop(system, None)
+            raise ValueError(f"Unknown system: {system}")
+        sig = (st.st_mtime_ns, st.st_size)
+        if entry is not None and entry[1] == sig:
+            self._entries[system] = (entry[0], sig, now)
+            return entry[0]
+        try:
+            rules = SystemRules.from_file(path, revision=self.loads + self.reloads + 1)
+        except Exception:
+            if entry is None:
+                raise
+            self.reload_errors += 1
+            self._entries[system] = (entry[0], sig, now)  # keep serving the last good version
+            return entry[0]
+        if entry is None:
+            self.loads += 1
+        else:
+            self.reloads += 1
+        self._entries[system] = (rules, sig, now)
+        return rules
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "systems_loaded": len(self._entries),
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
+
+RULES = RulesRegistry(check_interval=float(os.getenv("RULES_CHECK_INTERVAL", "1.0")))
+
+def get_rules(system: str) -> SystemRules:
+    """Shared, immutable rules for ``system`` (raises ValueError if unknown)."""
+    return RULES.get(system)
+
+def _vietnamese_fold_table() -> Dict[int, str]:
+    # Every precomposed Vietnamese letter (12 vowels x 5 tones, plus the toneless
+    # modified vowels) and Đ/đ -> its ASCII base letter. NFKD cannot fold Đ/đ.
+    table = {ord("Đ"): "D", ord("đ"): "d"}
+    for base in "aăâeêioôơuưy":
+        for tone in ("", "\u0300", "\u0301", "\u0309", "\u0303", "\u0323"):
+            for ch in (base, base.upper()):
+                composed = unicodedata.normalize("NFC", ch + tone)
+                if len(composed) == 1 and not composed.isascii():
+                    table[ord(composed)] = unicodedata.normalize("NFKD", composed)[0]
+    return table
+
+_VI_FOLD = _vietnamese_fold_table()
+
+def _strip_marks(text: str) -> str:
+    nfkd = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in nfkd if not unicodedata.combining(ch))
+
 def normalize_name(name: str, normalization: str = "ascii") -> str:
     name = name.strip()
-    if normalization == "ascii":
-        # Remove diacritics, keep basic letters/numbers/spaces
-        nfkd = unicodedata.normalize("NFKD", name)
-        stripped = "".join(ch for ch in nfkd if not unicodedata.combining(ch))
-        return stripped
+    if normalization == "ascii" and not name.isascii():
+        # Remove diacritics, keep basic letters/numbers/spaces. Vietnamese letters
+        # fold through one precompiled translate; NFKD only for anything left over.
+        folded = name.translate(_VI_FOLD)
+        return folded if folded.isascii() else _strip_marks(folded)
     return name
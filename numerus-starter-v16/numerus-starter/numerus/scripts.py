@@ -0,0 +1,77 @@
+from __future__ import annotations
+import unicodedata
+from collections import Counter
+from typing import Dict, Mapping, NamedTuple, Tuple
+
+# Per-script tokenizers: a system's char_map selects a script, and the
+# script's code-point ranges are compiled into one str.translate table that
+# maps every accepted spelling of a scored letter (accented, presentation
+# form, final form, orthographic variant) to the char_map letter itself and
+# deletes everything else. Scoring a name is then a single translate pass
+# whatever the alphabet.
+
+class _DropTable(dict):
+    # str.translate table: characters without an entry are deleted
+    def __missing__(self, key):
+        return None
+
+class Script(NamedTuple):
+    name: str                               # Unicode script prefix, e.g. "HEBREW"
+    ranges: Tuple[Tuple[int, int], ...]     # inclusive code-point ranges to consider
+    folds: Mapping[str, str]                # variant -> base letter, used when the variant is not scored itself
+
+SCRIPTS: Dict[str, Script] = {}
+
+def register_script(script: Script) -> Script:
+    SCRIPTS[script.name] = script
+    return script
+
+LATIN = register_script(Script("LATIN", ((0x0041, 0x024F), (0x1E00, 0x1EFF)), {}))
+GREEK = register_script(Script("GREEK", ((0x0370, 0x03FF), (0x1F00, 0x1FFF)), {"ς": "Σ"}))
+HEBREW = register_script(Script("HEBREW", ((0x0591, 0x05F4), (0xFB1D, 0xFB4F)), {
+    "ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ",
+}))
+ARABIC = register_script(Script("ARABIC", ((0x0610, 0x06FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)), {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه",
+}))
+
+def _script_of_char(ch: str) -> str:
+    return unicodedata.name(ch, "").split(" ", 1)[0]
+
+def script_for(char_map: Mapping[str, int]) -> Script:
+    """The registered script most of the char_map's letters belong to (Latin by default)."""
+    counts = Counter(_script_of_char(ch) for ch in char_map if len(ch) == 1)
+    for name, _ in counts.most_common():
+        if name in SCRIPTS:
+            return SCRIPTS[name]
+    return LATIN
+
+# Always given explicit entries: an explicit None deletes without the
+# per-character __missing__ call that non-ASCII translate would otherwise make
+_COMMON = ((0x0000, 0x007F), (0x0300, 0x036F), (0x2000, 0x206F))
+
+def base_letters(ch: str) -> str:
+    # Compatibility decomposition without combining marks: "Ầ" -> "A", "ﻻ" -> "لا"
+    return "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c)).upper()
+
+def compile_tokenizer(script: Script, char_map: Mapping[str, int]) -> _DropTable:
+    """Translate table: accepted spelling -> char_map letter(s); everything else deleted."""
+    table = _DropTable()
+    for lo, hi in script.ranges:
+        for cp in range(lo, hi + 1):
+            ch = chr(cp)
+            if ch in char_map:
+                continue
+            base = base_letters(ch)
+            if base and base != ch and all(c in char_map for c in base):
+                table[cp] = base
+    for variant, base in script.folds.items():
+        if variant not in char_map and base in char_map:
+            table[ord(variant)] = base
+    for ch in char_map:
+        if len(ch) == 1:
+            table[ord(ch)] = ch
+    for lo, hi in _COMMON + script.ranges:
+        for cp in range(lo, hi + 1):
+            table.setdefault(cp, None)
+    return table
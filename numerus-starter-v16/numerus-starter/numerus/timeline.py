@@ -0,0 +1,50 @@
+from __future__ import annotations
+import datetime, os
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict
+
+from .engine import _detailed_pinnacles, _digit_sum, _pinnacles_and_challenges, date_parts, lookup_date_profile
+from .reduction import Reducer
+from .rules import SystemRules
+
+# Whole-life chart data in one pass: the personal year of every calendar year
+# and the pinnacle/challenge active at every age, as parallel columns indexed
+# by age. Everything depends only on the date and the reduction policy, so
+# results are memoized per (date, policy) and shared between systems.
+
+MAX_AGE = 100
+TIMELINE_CACHE_SIZE = int(os.getenv("TIMELINE_CACHE_SIZE", "4096"))
+
+@lru_cache(maxsize=TIMELINE_CACHE_SIZE)
+def _timeline(y: int, m: int, d: int, reducer: Reducer) -> Dict:
+    dp = lookup_date_profile(y, m, d, reducer)
+    pc = _pinnacles_and_challenges(dp.life_path, dp.pinnacles, dp.challenges)
+    ages = range(MAX_AGE + 1)
+    years = range(y, y + MAX_AGE + 1)
+    # Stage k (0..3) runs from transition_ages[k - 1] up to transition_ages[k]; the 4th lasts for life
+    stage = [bisect_right(pc["transition_ages"], age, hi=3) for age in ages]
+    p, c = pc["pinnacles"], pc["challenges"]
+    return {
+        "date_of_birth": f"{y:04d}-{m:02d}-{d:02d}",
+        "life_path": dp.life_path,
+        "pinnacles_detailed": _detailed_pinnacles(pc),
+        "age": tuple(ages),
+        "year": tuple(years),
+        "personal_year": tuple(reducer(_digit_sum(year) + dp.md_digit_sum) for year in years),
+        "pinnacle": tuple(p[k] for k in stage),
+        "challenge": tuple(c[k] for k in stage),
+    }
+
+def timeline(dob: str, rules: SystemRules) -> Dict:
+    """Personal year, pinnacle and challenge for ages 0..MAX_AGE (columns indexed by age)."""
+    try:
+        y, m, d = date_parts(dob)
+        datetime.date(y, m, d)
+    except Exception:
+        raise ValueError("date_of_birth must be YYYY-MM-DD and valid")
+    return {"system": rules.name, **_timeline(y, m, d, rules.reducer)}
+
+def cache_stats() -> Dict[str, int]:
+    info = _timeline.cache_info()
+    return {"entries": info.currsize, "max_entries": info.maxsize, "hits": info.hits, "misses": info.misses}
@@ -0,0 +1,63 @@
+from __future__ import annotations
+import datetime, itertools
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from .engine import (_combine_tokens, _expression, _karmic_lessons, _maturity, _personality, _soul_urge,
+                     date_parts, date_profile)
+from .rules import SystemRules
+
+# What-if view of one name: drop a middle name, swap in a nickname, ... Each
+# spelling of each part is scored once (token scores are memoized per system)
+# and every variant is the sum of its parts' scores, so dozens of variants
+# cost about one analysis. Order never matters: every name number is a sum.
+
+MAX_VARIANTS = 512
+
+def name_variants(full_name: str, alternates: Mapping[str, Sequence[str]], rules: SystemRules,
+                  date_of_birth: Optional[str] = None) -> Dict:
+    """Name numbers for every combination of each part of ``full_name`` or one of its
+    alternates ("" drops the part). The unchanged name comes first."""
+    words = full_name.split()
+    unknown = sorted(set(alternates) - set(words))
+    if unknown:
+        raise ValueError(f"Not part of full_name: {', '.join(unknown)}")
+    options: List[List[str]] = []
+    for w in words:
+        opts = [w]
+        for alt in alternates.get(w, ()):
+            alt = " ".join(alt.split())
+            if alt not in opts:
+                opts.append(alt)
+        options.append(opts)
+    count = 1
+    for opts in options:
+        count *= len(opts)
+    if count > MAX_VARIANTS:
+        raise ValueError(f"too many variants ({count}); at most {MAX_VARIANTS}")
+
+    if date_of_birth:
+        try:
+            datetime.date(*date_parts(date_of_birth))
+        except Exception:
+            raise ValueError("date_of_birth must be YYYY-MM-DD and valid")
+    codec = rules.codec
+    scored = [[(o, codec.tokens(o)) for o in opts] for opts in options]
+    lp = date_profile(date_of_birth, rules).life_path if date_of_birth else None
+    variants, seen = [], set()
+    for combo in itertools.product(*scored):
+        name = " ".join(o for o, _ in combo if o)
+        if name in seen:
+            continue
+        seen.add(name)
+        nm = _combine_tokens([t for _, tokens in combo for t in tokens], codec)
+        item = {
+            "full_name": name,
+            "expression": _expression(nm, rules),
+            "soul_urge": _soul_urge(nm, rules),
+            "personality": _personality(nm, rules),
+            "karmic_lessons": _karmic_lessons(nm),
+        }
+        if lp is not None:
+            item["maturity"] = _maturity(lp, item["expression"], rules)
+        variants.append(item)
+    return {"system": rules.name, "variants": variants}
@@ -0,0 +1,30 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from numerus import api
+
+def test_batch_stream_survives_a_failing_item(monkeypatch):
+    monkeypatch.setenv("REQUIRE_API_KEY", "0")
+    monkeypatch.setenv("REQUIRE_JWT", "0")
+    real = api._with_input
+
+    def flaky(result, req):
+        if req.full_name == "Broken":
+            raise RuntimeError("cannot expand")
+        return real(result, req)
+
+    monkeypatch.setattr(api, "_with_input", flaky)
+    names = ["An", "Broken", "Binh"]
+    payload = {"requests": [{"full_name": n, "date_of_birth": "1990-01-15", "target_year": 2025} for n in names]}
+    r = TestClient(api.app).post("/v1/analyze/batch", json=payload)
+    assert r.status_code == 200
+    results = json.loads(r.content)["results"]  # the whole body is still one valid JSON document
+    assert [item.get("input", {}).get("full_name") for item in results] == ["An", None, "Binh"]
+    assert results[1] == {"error": "cannot expand"}
+    assert all("numbers" in results[i] for i in (0, 2))
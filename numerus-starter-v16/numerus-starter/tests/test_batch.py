@@ -0,0 +1,47 @@
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from numerus.batch import _digit_sum
+from numerus.rules import SystemRules
+from numerus.engine import analyze, analyze_batch, AnalysisInput
+
+SYSTEMS = ["pythagorean", "chaldean", "vietnamese_latin", "greek_isopsephy", "hebrew_gematria", "arabic_abjad"]
+
+def _corpus(k=300, seed=7):
+    rnd = random.Random(seed)
+    alpha = "abcdefghijklmnopqrstuvwxyzăâêôơưđàáảãạ ÀÉÝ-'.ΑΩΣשלוםمحدعي"
+    names = ["Nguyen Van A", "Trần Thị Thu Hà", "", "ΙΩΑΝΝΗΣ", "שלום", "محمد علي"]
+    names += ["".join(rnd.choice(alpha) for _ in range(rnd.randint(0, 30))) for _ in range(k)]
+    dobs = [f"{rnd.randint(1801, 2199)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}" for _ in names]
+    dobs[:3] = ["2000-02-29", "1999-11-29", "1990-1-5"]
+    return names, dobs
+
+@pytest.mark.parametrize("system", SYSTEMS)
+def test_batch_matches_analyze(system):
+    rules = SystemRules.load(system)
+    names, dobs = _corpus()
+    cols = analyze_batch(names, dobs, rules, target_year=2025)
+    for i, (name, dob) in enumerate(zip(names, dobs)):
+        ref = analyze(AnalysisInput(full_name=name, date_of_birth=dob, target_year=2025), rules)["numbers"]
+        for key in ("life_path", "birthday", "expression", "soul_urge", "personality", "maturity", "personal_year"):
+            assert cols[key][i] == ref[key], (key, name, dob)
+        for key in ("pinnacles", "challenges", "transition_ages"):
+            assert cols[key][i].tolist() == ref[key], (key, name, dob)
+        assert cols["lo_shu"][i].tolist() == [ref["lo_shu"][str(k)] for k in range(1, 10)]
+        assert [k for k in range(1, 10) if cols["karmic_lessons"][i][k - 1]] == ref["karmic_lessons"]
+
+def test_batch_rejects_invalid_dates():
+    with pytest.raises(ValueError):
+        analyze_batch(["A"], ["1990-02-30"], "pythagorean")
+    for bad in ("", "NaT", "2000", "2000-01", "2000-01-01T12", "0000-01-01"):
+        with pytest.raises(ValueError):
+            analyze_batch(["A", "B"], ["1990-01-05", bad], "pythagorean")
+
+def test_digit_sum_refuses_negative_values():
+    assert _digit_sum(np.array([0, 9, 1999])).tolist() == [0, 9, 28]
+    with pytest.raises(ValueError):
+        _digit_sum(np.array([5, -1]))
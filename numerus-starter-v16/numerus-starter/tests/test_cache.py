@@ -0,0 +1,29 @@
+
+import time
+
+from numerus.cache import ResultCache, next_year_rollover
+
+def test_lru_eviction_and_stats():
+    c = ResultCache(maxsize=2)
+    c.put("a", 1); c.put("b", 2)
+    assert c.get("a") == 1          # "a" becomes most recent
+    c.put("c", 3)                   # evicts "b"
+    assert c.get("b") is None and c.get("c") == 3
+    st = c.stats()
+    assert (st["hits"], st["misses"], st["evictions"], st["entries"]) == (2, 1, 1, 2)
+
+def test_byte_bound():
+    c = ResultCache(maxsize=100, max_bytes=100, sizeof=lambda v: v)
+    c.put("a", 60); c.put("b", 30)
+    c.put("c", 50)                  # 140 > 100 -> evict "a"
+    assert c.get("a") is None and c.get("b") == 30
+    c.put("huge", 500)              # larger than the whole cache: not stored
+    assert c.get("huge") is None and c.stats()["approx_bytes"] == 80
+
+def test_expiry():
+    c = ResultCache()
+    c.put("old", 1, expires_at=time.time() - 1)
+    c.put("new", 2, expires_at=time.time() + 60)
+    assert c.get("old") is None and c.get("new") == 2
+    assert c.stats()["expirations"] == 1
+    assert next_year_rollover() > time.time()
@@ -0,0 +1,45 @@
+
+import random
+
+import pytest
+
+from numerus.rules import SystemRules
+from numerus.engine import analyze, canonical_name, AnalysisInput
+
+SYSTEMS = ["pythagorean", "chaldean", "vietnamese_latin", "greek_isopsephy", "hebrew_gematria", "arabic_abjad"]
+
+def _strip_input(res):
+    res = dict(res)
+    res.pop("input")
+    return res
+
+def test_spellings_share_a_key():
+    for system in ("pythagorean", "chaldean", "vietnamese_latin"):
+        rules = SystemRules.load(system)
+        keys = {canonical_name(n, rules) for n in ("Nguyen Van A", "NGUYỄN VĂN A", "  nguyễn  văn a ", "nguyen-van, a.")}
+        assert len(keys) == 1
+    # A trace shows the letters themselves, so traced keys keep the diacritics
+    rules = SystemRules.load("vietnamese_latin")
+    assert canonical_name("Nguyen Van A", rules, trace=True) != canonical_name("NGUYỄN VĂN A", rules, trace=True)
+
+def test_different_letters_different_keys():
+    rules = SystemRules.load("pythagorean")
+    assert canonical_name("Nguyen Van A", rules) != canonical_name("Nguyen Van B", rules)
+    assert canonical_name("Van Nguyen A", rules) != canonical_name("Nguyen Van A", rules)
+
+@pytest.mark.parametrize("system", SYSTEMS)
+def test_key_equality_implies_result_equality(system):
+    rules = SystemRules.load(system)
+    rnd = random.Random(system)
+    pieces = ["nguyễn", "NGUYEN", "Văn", "van", "  ", "-", "'", ".", "Thị", "THI", "a", "Á", "ΙΩ", "שלום", "محمد", "ß", "1", "đ"]
+    names = ["".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 6))) for _ in range(400)]
+    for trace in (False, True):
+        groups = {}
+        for name in names:
+            groups.setdefault(canonical_name(name, rules, trace), []).append(name)
+        merged = 0
+        for key, group in groups.items():
+            results = [_strip_input(analyze(AnalysisInput(full_name=n, date_of_birth="1990-01-23", target_year=2025), rules, trace=trace)) for n in group]
+            assert all(r == results[0] for r in results), (key, group)
+            merged += len(group) > 1
+        assert merged > 0
@@ -0,0 +1,48 @@
+from numerus.rules import SystemRules, normalize_name
+from numerus.engine import NameProfile, name_profile
+
+def test_codec_sums_match_char_map():
+    rules = SystemRules.load("pythagorean")
+    letters = rules.codec.letters("Nguyễn Văn A!")
+    assert letters == "NGUYENVANA"
+    v, c, total = rules.codec.sums(letters)
+    assert total == sum(rules.char_map[ch] for ch in letters)
+    assert v == sum(rules.char_map[ch] for ch in "UYEAA")
+    assert c == total - v
+
+def test_codec_y_policy():
+    assert SystemRules.load("pythagorean").codec.split("YY") == ("YY", "")
+    assert SystemRules.load("chaldean").codec.split("YY") == ("", "YY")
+
+def test_script_tokenizers_fold_variants():
+    hebrew = SystemRules.load("hebrew_gematria")
+    assert hebrew.codec.script == "HEBREW"
+    assert hebrew.codec.letters("שָׁלוֹם") == "שלום"          # points dropped, final mem kept
+    assert hebrew.codec.total("שלום") == 300 + 30 + 6 + 40
+    arabic = SystemRules.load("arabic_abjad")
+    assert arabic.codec.letters("أحمد فاطمة") == "احمدفاطمه"
+    assert arabic.codec.letters("ﻻ") == "لا"                # lam-alef ligature
+    greek = SystemRules.load("greek_isopsephy")
+    assert greek.codec.letters("Ἰωάννης") == "ΙΩΑΝΝΗΣ"
+
+def test_vietnamese_toned_vowels_classified_by_base():
+    codec = SystemRules.load("vietnamese_latin").codec
+    letters = codec.letters("Nguyễn Thị Ánh Đức")
+    assert letters == "NGUYỄNTHỊÁNHĐỨC"
+    assert codec.split(letters) == ("UYỄỊÁỨ", "NGNTHNHĐC")
+
+def test_vietnamese_fold_table():
+    assert normalize_name(" Đặng Thị Ưng Ỷ ") == "Dang Thi Ung Y"
+    assert normalize_name("Müller") == "Muller"                     # NFKD fallback
+    assert normalize_name("Đức", "none") == "Đức"
+    assert SystemRules.load("pythagorean").codec.letters("Đỗ Đức") == "DODUC"
+
+def test_token_memo_matches_whole_name_scoring():
+    rules = SystemRules.load("vietnamese_latin")
+    for name in ("Nguyễn Văn Đức", "  Trần  Thị\\tHà ", "", "Nguyễn Nguyễn"):
+        letters, vowels, consonants, v, c, packed = rules.codec.score(name)
+        counts = rules.codec.value_counts(packed, letters)
+        assert name_profile(name, rules) == NameProfile(letters, vowels, consonants, v, c, v + c, counts)
+        assert sum(counts) == sum(rules.char_map[ch] < 10 for ch in letters)
+    stats = rules.codec.token_stats()
+    assert stats["hits"] >= 1 and stats["entries"] <= stats["max_entries"]
@@ -1,5 +1,8 @@
 
-from numerus.reporter import _match_rule, _score_rule
+import json, os
+
+from numerus.reporter import (_ContextIndex, _ContextRuleStore, _load_context_rules, _match_rule, _score_rule,
+                              _select_context)
 
 def test_match_simple():
     assert _match_rule({"lp":1, "ex":7}, 1,7,3,4) is True
@@ -11,3 +14,33 @@ def test_score():
     assert _score_rule({"lp":1, "su":2}) == 3
     assert _score_rule({"lp":1, "pe":8}) == 2
     assert _score_rule({"ex":7}) == 1
+
+def test_index_orders_like_linear_scan():
+    rules = [
+        {"ex": 7, "vi": "single"},
+        {"lp": 1, "ex": 7, "vi": "pair"},
+        {"lp": [1, 10], "su": 3, "vi": "lp-su", "roles": ["PM"]},
+        {"lp": 1, "ex": 7, "vi": "signature", "signature": True},
+        {"lp": 2, "ex": 7, "vi": "other"},
+    ]
+    idx = _ContextIndex(rules)
+    assert [c["text"] for c in idx.select(1, 7, 3, 4, None)] == ["signature", "pair", "lp-su", "single"]
+    assert [c["text"] for c in idx.select(10, 7, 3, 4, "product_manager")] == ["lp-su"]
+    assert idx.select(None, None, None, None, None) == []
+
+def test_store_rebuilds_when_file_changes(tmp_path):
+    path = tmp_path / "context_rules.json"
+    path.write_text(json.dumps([{"lp": 1, "vi": "a", "habits": []}]), encoding="utf-8")
+    store = _ContextRuleStore(str(path), check_interval=0)
+    assert [c["text"] for c in store.get().select(1, 2, 3, 4, None)] == ["a"]
+    path.write_text(json.dumps([{"lp": 1, "vi": "b", "habits": []}, {"ex": 2, "vi": "c", "habits": []}]), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert [c["text"] for c in store.get().select(1, 2, 3, 4, None)] == ["b", "c"]
+    path.write_text("{broken", encoding="utf-8")
+    os.utime(path, ns=(2, 2))
+    assert len(store.get()) == 2 and store.stats()["reload_errors"] == 1
+
+def test_select_context_uses_shipped_rules():
+    assert len(_load_context_rules()) > 0
+    ctx = _select_context({"life_path": 1, "expression": 7, "soul_urge": 3, "personality": 4})
+    assert any(c["text"].startswith("LP 1 × EX 7") for c in ctx)
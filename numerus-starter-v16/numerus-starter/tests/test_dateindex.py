@@ -0,0 +1,43 @@
+import datetime
+
+import pytest
+
+from numerus import dateindex, datetable
+from numerus.engine import compute_date_profile
+from numerus.rules import SystemRules
+
+def _brute(rules, start, end, pred):
+    day, out = start, []
+    while day <= end:
+        if pred(compute_date_profile(day.year, day.month, day.day, rules.reducer)):
+            out.append(day.isoformat())
+        day += datetime.timedelta(days=1)
+    return out
+
+@pytest.mark.parametrize("system", ["pythagorean", "chaldean"])
+def test_find_dates_matches_brute_force(system):
+    rules = SystemRules.load(system)
+    res = dateindex.find_dates(rules, {"life_path": 11, "pinnacle_2": 4}, "1990-03-01", "2001-02-28", limit=10000)
+    expected = _brute(rules, datetime.date(1990, 3, 1), datetime.date(2001, 2, 28),
+                      lambda p: p.life_path == 11 and p.pinnacles[1] == 4)
+    assert res["dates"] == expected and res["total"] == len(expected) > 0
+    page = dateindex.find_dates(rules, {"life_path": 11, "pinnacle_2": 4}, "1990-03-01", "2001-02-28", limit=5, offset=5)
+    assert page["dates"] == expected[5:10] and page["total"] == len(expected)
+
+def test_index_built_from_date_table(tmp_path, monkeypatch):
+    rules = SystemRules.load("chaldean")
+    datetable.build(rules.reducer, str(tmp_path))
+    monkeypatch.setattr(datetable, "TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    first, columns = dateindex._columns_from_table(rules.reducer)
+    assert (first, {f: bytes(c) for f, c in columns.items()}) == dateindex._computed_columns(rules.reducer)
+
+def test_find_dates_validation():
+    rules = SystemRules.load("pythagorean")
+    with pytest.raises(ValueError, match="Unknown fields"):
+        dateindex.find_dates(rules, {"lifepath": 8}, "2027-01-01", "2027-12-31")
+    with pytest.raises(ValueError):
+        dateindex.find_dates(rules, {"life_path": 8}, "2027-12-31", "2027-01-01")
+    with pytest.raises(ValueError):
+        dateindex.find_dates(rules, {"life_path": 8}, "1700-01-01", "2027-01-01")
+    assert dateindex.find_dates(rules, {"life_path": 99}, "2027-01-01", "2027-12-31")["total"] == 0
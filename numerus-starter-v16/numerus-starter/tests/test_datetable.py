@@ -0,0 +1,49 @@
+
+import datetime
+
+from numerus import datetable
+from numerus.rules import SystemRules
+from numerus.engine import date_profile, compute_date_profile, analyze, AnalysisInput
+
+def test_table_matches_computed_profiles(tmp_path, monkeypatch):
+    rules = SystemRules.load("pythagorean")
+    datetable.build(rules.reducer, str(tmp_path), first_year=1999, last_year=2001)
+    monkeypatch.setattr(datetable, "TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    table = datetable.date_table(rules.reducer)
+    assert table is not None and table.count == 365 * 3 + 1  # 2000 is a leap year
+    day = datetime.date(1999, 1, 1)
+    while day.year <= 2001:
+        assert table.record(day.year, day.month, day.day) is not None
+        assert date_profile(day.isoformat(), rules) == compute_date_profile(day.year, day.month, day.day, rules.reducer)
+        day += datetime.timedelta(days=1)
+    # outside the table range and invalid dates fall back to computation
+    assert table.record(2002, 1, 1) is None and table.record(2001, 2, 29) is None
+    assert date_profile("1850-03-04", rules) == compute_date_profile(1850, 3, 4, rules.reducer)
+    res = analyze(AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-15"), rules)
+    assert res["numbers"]["life_path"] == 6
+
+def test_missing_table_is_none(tmp_path, monkeypatch):
+    monkeypatch.setattr(datetable, "TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    assert datetable.date_table(SystemRules.load("chaldean").reducer) is None
+
+def test_stale_tables_are_ignored(tmp_path, monkeypatch):
+    rules = SystemRules.load("pythagorean")
+    path = datetable.build(rules.reducer, str(tmp_path), first_year=1999, last_year=2001)
+    monkeypatch.setattr(datetable, "TABLE_DIR", str(tmp_path))
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    assert datetable.date_table(rules.reducer) is not None
+    # Built by other date arithmetic: the stored fingerprint no longer matches
+    with open(path, "r+b") as f:
+        header = bytearray(f.read(datetable._HEADER.size))
+        magic, size, version, first, count, fp = datetable._HEADER.unpack(header)
+        f.seek(0)
+        f.write(datetable._HEADER.pack(magic, size, version, first, count, fp ^ 1))
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    assert datetable.date_table(rules.reducer) is None
+    datetable.build(rules.reducer, str(tmp_path), first_year=1999, last_year=2001)
+    monkeypatch.setattr(datetable, "_TABLES", {})
+    monkeypatch.setattr(datetable, "FORMAT_VERSION", datetable.FORMAT_VERSION + 1)
+    assert datetable.date_table(rules.reducer) is None
+    assert date_profile("2000-07-15", rules) == compute_date_profile(2000, 7, 15, rules.reducer)
@@ -1,6 +1,10 @@
+import pytest
 
+from numerus import engine
+from numerus.cache import approx_size
 from numerus.rules import SystemRules
-from numerus.engine import analyze, AnalysisInput
+from numerus.engine import (analyze, analyze_result, AnalysisInput, date_profile, life_path, name_profile,
+                            pinnacles_and_challenges)
 
 def test_basic_analysis():
     rules = SystemRules.load("pythagorean")
@@ -12,3 +16,93 @@ def test_basic_analysis():
     assert result["numbers"]["life_path"] in range(1, 34)  # allow master numbers
     assert result["numbers"]["birthday"] in range(1, 34)
     assert isinstance(result["numbers"]["lo_shu"], dict)
+
+def test_profiles_feed_every_metric():
+    rules = SystemRules.load("pythagorean")
+    nm = name_profile("Nguyen Van A", rules)
+    assert nm.letters == "NGUYENVANA"
+    assert nm.total == nm.vowel_sum + nm.consonant_sum
+    assert sum(nm.value_counts) == len(nm.letters)
+    dp = date_profile("2000-07-15", rules)
+    assert (dp.year, dp.month, dp.day, dp.digit_sum) == (2000, 7, 15, 15)
+    assert dp.lo_shu == (1, 1, 0, 0, 1, 0, 1, 0, 0)
+    assert pinnacles_and_challenges("2000-07-15", rules)["transition_ages"][0] == 36 - life_path("2000-07-15", rules)
+
+def test_fields_compute_only_what_is_asked(monkeypatch):
+    rules = SystemRules.load("pythagorean")
+    def _no_name_scan(*a, **k):
+        raise AssertionError("name profile should not be needed")
+    monkeypatch.setattr(engine, "name_profile", _no_name_scan)
+    res = analyze(AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-15", target_year=2025,
+                                fields=["personal_year", "life_path"]), rules)
+    assert list(res["numbers"]) == ["life_path", "personal_year"]
+    with pytest.raises(ValueError):
+        analyze(AnalysisInput(full_name="A", date_of_birth="2000-07-15", fields=["date_profile"]), rules)
+
+def test_custom_metric_plugs_into_registry(monkeypatch):
+    monkeypatch.setattr(engine, "_REGISTRY", dict(engine._REGISTRY))
+    engine.register_metric("balance", "soul_urge", "personality")(lambda ev, su, pe: abs(su - pe))
+    rules = SystemRules.load("pythagorean")
+    res = analyze(AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-15", fields=["balance"]), rules)
+    full = analyze(AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-15"), rules)["numbers"]
+    assert res["numbers"] == {"balance": abs(full["soul_urge"] - full["personality"])}
+    assert "balance" in engine.available_fields()
+
+def test_compact_result_expands_to_report():
+    rules = SystemRules.load("pythagorean")
+    inp = AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-15", target_year=2025)
+    compact = analyze_result(inp, rules)
+    assert not hasattr(compact, "__dict__")
+    assert compact.to_dict() == analyze(inp, rules)
+    assert compact.to_dict()["numbers"] is not compact.to_dict()["numbers"]
+    assert approx_size(compact) < approx_size(compact.to_dict()) / 2
+
+def test_karmic_debt_hits_always_reported():
+    rules = SystemRules.load("pythagorean")
+    inp = AnalysisInput(full_name="Nguyen Van A", date_of_birth="2000-07-07", target_year=2025)
+    plain, traced = analyze(inp, rules), analyze(inp, rules, trace=True)
+    assert plain["numbers"]["karmic_debt_hits"] == traced["trace"]["karmic_debt_hits"]
+    assert {"where": "life_path_total", "value": 16} in plain["numbers"]["karmic_debt_hits"]
+    assert traced["trace"]["pre_reduction"]["life_path_total"] == 16
+    assert {"where": "p1_raw", "value": 14} in plain["numbers"]["karmic_debt_hits"]
+    assert traced["trace"]["pinnacles_raw"]["p1_raw"] == 14
+
+def test_analyze_multi_shares_profiles(monkeypatch):
+    systems = [SystemRules.load(s) for s in ("pythagorean", "chaldean", "vietnamese_latin")]
+    inp = AnalysisInput(full_name="Nguyễn Văn Đức", date_of_birth="1990-01-15", target_year=2025)
+    expected = [analyze(inp, rules) for rules in systems]
+    calls = []
+    real = engine.date_profile
+    monkeypatch.setattr(engine, "date_profile", lambda dob, rules: calls.append(dob) or real(dob, rules))
+    results = engine.analyze_multi(inp, systems)
+    assert [r.to_dict() for r in results] == expected
+    assert len(calls) == 2  # pythagorean and vietnamese_latin share a policy; chaldean has no 33
+
+def test_analyze_multi_reuses_name_work_across_systems(monkeypatch):
+    pyth, chal = SystemRules.load("pythagorean"), SystemRules.load("chaldean")
+    twin = SystemRules.load("pythagorean")  # separately compiled codec, same letter tables
+    assert twin.codec is not pyth.codec and twin.codec.key == pyth.codec.key
+    inp = AnalysisInput(full_name="Nguyễn Văn Đức", date_of_birth="1990-01-15", target_year=2025)
+    expected = [analyze(inp, rules) for rules in (pyth, chal, twin)]
+    folds, profiles = [], []
+    real_fold, real_combine = engine.normalize_name, engine._combine_tokens
+    monkeypatch.setattr(engine, "normalize_name", lambda t, mode: folds.append(t) or real_fold(t, mode))
+    monkeypatch.setattr(engine, "_combine_tokens", lambda parts, codec: profiles.append(codec) or real_combine(parts, codec))
+    results = engine.analyze_multi(inp, [pyth, chal, twin])
+    assert [r.to_dict() for r in results] == expected
+    assert len(folds) == 3  # one fold per token: both systems normalize to ascii
+    assert profiles == [pyth.codec, chal.codec]  # the twin reuses pythagorean's profile
+    profiles.clear()
+    engine.analyze_multi(AnalysisInput(full_name="An", date_of_birth="1990-01-15", fields=["life_path"]), [pyth, chal])
+    assert profiles == []
+
+def test_cached_result_hands_out_its_own_trace():
+    rules = SystemRules.load("pythagorean")
+    result = analyze_result(AnalysisInput(full_name="Nguyen Van A", date_of_birth="1990-01-15"), rules, trace=True)
+    first = result.to_dict()
+    first["trace"]["pre_reduction"]["expression_total"] = -1
+    first["trace"]["name"]["all_letters"].append("Z")
+    first["trace"]["extra"] = True
+    again = result.to_dict()["trace"]
+    assert again["pre_reduction"]["expression_total"] != -1 and "extra" not in again
+    assert "Z" not in again["name"]["all_letters"]
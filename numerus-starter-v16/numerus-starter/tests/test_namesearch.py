@@ -0,0 +1,41 @@
+import itertools
+
+import pytest
+
+from numerus.engine import analyze, AnalysisInput
+from numerus.namesearch import search_names
+from numerus.rules import SystemRules
+
+FAMILY = ["Nguyễn", "Trần", "Lê", "Phạm", "Đặng"]
+MIDDLE = ["", "Văn", "Thị", "Minh", "Ngọc Thu"]
+GIVEN = ["An", "Bình", "Chi", "Dũng", "Hà", "Hương", "Khoa", "Linh", "Mai", "Nam", "Phúc", "Vy"]
+
+@pytest.mark.parametrize("system", ["pythagorean", "chaldean"])
+@pytest.mark.parametrize("targets", [{"expression": 11}, {"expression": 7, "soul_urge": 3}, {"personality": 4}])
+def test_search_matches_brute_force(system, targets):
+    rules = SystemRules.load(system)
+    res = search_names(rules, [FAMILY, MIDDLE, GIVEN], targets, limit=1000)
+    expected = set()
+    for parts in itertools.product(FAMILY, MIDDLE, GIVEN):
+        name = " ".join(p for p in parts if p)
+        numbers = analyze(AnalysisInput(full_name=name, date_of_birth="2000-01-01"), rules)["numbers"]
+        if all(numbers[k] == t for k, t in targets.items()):
+            expected.add(name)
+    assert {r["full_name"] for r in res["results"]} == expected and res["total"] == len(expected)
+    assert res["examined"] < res["combinations"]
+
+def test_search_ranking_and_pagination():
+    rules = SystemRules.load("pythagorean")
+    res = search_names(rules, [FAMILY, MIDDLE, GIVEN], {"expression": 5}, limit=1000)
+    ranks = [sum(slot.index(p) for slot, p in zip((FAMILY, GIVEN), (r["full_name"].split()[0], r["full_name"].split()[-1])))
+             for r in res["results"] if len(r["full_name"].split()) == 2]
+    assert ranks == sorted(ranks)
+    page = search_names(rules, [FAMILY, MIDDLE, GIVEN], {"expression": 5}, limit=3, offset=2)
+    assert page["results"] == res["results"][2:5]
+    with pytest.raises(ValueError):
+        search_names(rules, [FAMILY, GIVEN], {"life_path": 5})
+    with pytest.raises(ValueError, match="at least one target"):
+        search_names(rules, [FAMILY, GIVEN], {})
+    for offset in (0, 7, res["total"] - 1):
+        page = search_names(rules, [FAMILY, MIDDLE, GIVEN], {"expression": 5}, limit=4, offset=offset)
+        assert page["results"] == res["results"][offset:offset + 4] and page["total"] == res["total"]
@@ -0,0 +1,66 @@
+import datetime
+import hashlib
+import json
+
+import pytest
+
+from numerus.engine import personal_day, personal_month, personal_year
+from numerus.rules import SystemRules
+from numerus import planner
+
+@pytest.mark.parametrize("system", ["pythagorean", "chaldean"])
+def test_planner_matches_engine_per_day(system):
+    rules = SystemRules.load(system)
+    first, last = planner.date_range("2024-11-20", "2026-02-03")
+    lines = b"".join(planner.ndjson(planner.iter_months("1990-01-15", rules, first, last))).splitlines()
+    assert len(lines) == (last - first).days + 1
+    for i, line in enumerate(lines):
+        row = json.loads(line)
+        day = (first + datetime.timedelta(days=i)).isoformat()
+        assert row["date"] == day
+        assert row["personal_year"] == personal_year("1990-01-15", int(day[:4]), rules)
+        assert row["personal_month"] == personal_month("1990-01-15", int(day[:4]), int(day[5:7]), rules)
+        assert row["personal_day"] == personal_day("1990-01-15", day, rules)
+
+def test_personal_month_and_day_reduce_from_personal_year():
+    rules = SystemRules.load("pythagorean")
+    py = personal_year("1990-01-15", 2025, rules)  # 2+0+2+5 + 1 + 1+5 = 16 -> 7
+    assert py == 7
+    assert personal_month("1990-01-15", 2025, 4, rules) == 11       # 7 + 4, master kept
+    assert personal_day("1990-01-15", "2025-04-20", rules) == 4     # 11 + 20 = 31 -> 4
+    with pytest.raises(ValueError):
+        personal_month("1990-01-15", 2025, 13, rules)
+
+def test_ics_and_range_validation():
+    rules = SystemRules.load("pythagorean")
+    first, last = planner.date_range("2025-12-31", "2026-01-01")
+    text = b"".join(planner.ics(planner.iter_months("1990-01-15", rules, first, last), "1990-01-15", rules)).decode()
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    assert text.count("BEGIN:VEVENT") == 2
+    assert "DTSTART;VALUE=DATE:20251231\r\nDTEND;VALUE=DATE:20260101\r\n" in text
+    assert hashlib.sha1(b"1990-01-15|" + rules.name.encode()).hexdigest()[:16] not in text
+    with pytest.raises(ValueError):
+        planner.date_range("2025-02-01", "2025-01-01")
+    with pytest.raises(ValueError):
+        planner.date_range("1900-01-01", "2100-01-01")
+    # Generated lazily: the first month of a long range costs one block
+    first, last = planner.date_range("1950-01-01", "2049-12-31")
+    assert next(planner.iter_months("1990-01-15", rules, first, last)).personal_days[:1] != ()
+
+def test_ics_uid_is_keyed_by_secret(monkeypatch):
+    rules = SystemRules.load("pythagorean")
+    monkeypatch.delenv("CALENDAR_UID_SECRET", raising=False)
+    assert planner._calendar_uid("1990-01-15", rules) != planner._calendar_uid("1990-01-15", rules)
+    monkeypatch.setenv("CALENDAR_UID_SECRET", "s1")
+    uid = planner._calendar_uid("1990-01-15", rules)
+    assert uid == planner._calendar_uid("1990-01-15", rules) != planner._calendar_uid("1990-01-16", rules)
+    monkeypatch.setenv("CALENDAR_UID_SECRET", "s2")
+    assert planner._calendar_uid("1990-01-15", rules) != uid
+
+def test_ics_last_representable_day():
+    rules = SystemRules.load("pythagorean")
+    first, last = planner.date_range("9999-12-30", "9999-12-31")
+    text = b"".join(planner.ics(planner.iter_months("1990-01-15", rules, first, last), "1990-01-15", rules)).decode()
+    assert text.count("BEGIN:VEVENT") == 2 and text.endswith("END:VCALENDAR\r\n")
+    assert "DTSTART;VALUE=DATE:99991230\r\nDTEND;VALUE=DATE:99991231\r\n" in text
+    assert "DTSTART;VALUE=DATE:99991231\r\nSUMMARY:" in text
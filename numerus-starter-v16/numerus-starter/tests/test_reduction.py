@@ -0,0 +1,57 @@
+
+import dataclasses
+
+import pytest
+
+from numerus.rules import SystemRules
+from numerus.reduction import Reducer, reducer_for
+
+SYSTEMS = ["pythagorean", "chaldean", "vietnamese_latin", "greek_isopsephy", "hebrew_gematria", "arabic_abjad"]
+
+def _legacy_reduce(n, rules):
+    # Verbatim copy of the original string-based engine.reduce_number
+    if n < 10:
+        return n
+    if rules.keep_master and n in rules.master_numbers:
+        return n
+    s = sum(int(d) for d in str(n))
+    if rules.keep_master and s in rules.master_numbers:
+        return s
+    while s >= 10:
+        if rules.keep_master and s in rules.master_numbers:
+            break
+        s = sum(int(d) for d in str(s))
+    return s
+
+@pytest.mark.parametrize("system", SYSTEMS)
+def test_classic_matches_legacy(system):
+    rules = SystemRules.load(system)
+    for n in list(range(0, 20000)) + list(range(99990, 100100)) + [10**9 + 7, 999999999999]:
+        assert rules.reducer(n) == _legacy_reduce(n, rules), n
+
+def test_legacy_without_masters():
+    rules = dataclasses.replace(SystemRules.load("pythagorean"), keep_master=False)
+    r = reducer_for("classic", rules.master_numbers, False, False)
+    for n in range(0, 30000):
+        assert r(n) == _legacy_reduce(n, rules)
+
+def test_small_table_bound_folds_exactly():
+    rules = SystemRules.load("pythagorean")
+    small = Reducer("classic", frozenset(rules.master_numbers), bound=40)
+    for n in range(0, 50000):
+        assert small(n) == _legacy_reduce(n, rules)
+
+def test_reduce_master_reduces_masters():
+    r = reducer_for("classic", {11, 22, 33}, keep_master=True, reduce_master=True)
+    assert (r(11), r(22), r(33), r(29)) == (2, 4, 6, 2)
+
+def test_digital_root_method():
+    r = reducer_for("digital_root", {11, 22, 33}, keep_master=True, reduce_master=False)
+    assert r(11) == 11 and r(22) == 22
+    assert r(29) == 2          # classic would stop at the intermediate master 11
+    assert r(0) == 0 and r(9) == 9 and r(18) == 9
+    assert r(10**7 + 3) == 4
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        Reducer("sideways", frozenset())
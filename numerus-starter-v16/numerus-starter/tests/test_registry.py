@@ -0,0 +1,40 @@
+import json, os, shutil
+
+import pytest
+
+from numerus.rules import DATA_DIR, RulesRegistry, get_rules
+
+def _bump(path, data):
+    st = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+def test_shared_immutable_instances():
+    rules = get_rules("pythagorean")
+    assert get_rules("pythagorean") is rules
+    with pytest.raises(Exception):
+        rules.keep_master = False
+    with pytest.raises(TypeError):
+        rules.char_map["A"] = 9
+    for bad in ("nope", "../systems/pythagorean", ""):
+        with pytest.raises(ValueError):
+            get_rules(bad)
+
+def test_hot_reload_on_change(tmp_path):
+    shutil.copy(os.path.join(DATA_DIR, "pythagorean.json"), tmp_path / "demo.json")
+    reg = RulesRegistry(str(tmp_path), check_interval=0)
+    first = reg.get("demo")
+    assert reg.get("demo") is first and reg.stats()["loads"] == 1
+
+    data = json.loads((tmp_path / "demo.json").read_text(encoding="utf-8"))
+    data["name"] = "Demo v2"
+    _bump(str(tmp_path / "demo.json"), data)
+    second = reg.get("demo")
+    assert second.name == "Demo v2" and second.revision != first.revision
+    assert reg.stats()["reloads"] == 1
+
+    (tmp_path / "demo.json").write_text("{broken", encoding="utf-8")
+    os.utime(tmp_path / "demo.json", ns=(0, os.stat(tmp_path / "demo.json").st_mtime_ns + 2 * 10**9))
+    assert reg.get("demo") is second
+    assert reg.stats()["reload_errors"] == 1
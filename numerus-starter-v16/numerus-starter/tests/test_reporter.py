@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from numerus import en_reporter, packs, reporter
+from numerus.engine import analyze, AnalysisInput
+from numerus.rules import SystemRules
+
+def test_fragments_are_prerendered_and_shared():
+    text = reporter.describe_life_path(7)
+    assert text is reporter.describe_life_path(7) is reporter.FRAGMENTS["vi"]["life_path"][7]
+    assert text == reporter._render_life_path(7) and "7 – Nội quán" in text
+    assert reporter.describe_challenges([0, 3]) == [reporter._render_challenge((1, 0)), reporter._render_challenge((2, 3))]
+    assert reporter.describe_lo_shu({"1": 5})["each"]["1"] == reporter._render_lo_shu(("1", 5))
+
+def test_numbers_outside_tables_render_on_demand():
+    assert reporter.describe_expression(44) == reporter._render_expression(44)
+    assert reporter.describe_personal_year(44) == "Năm cá nhân 44. "
+    assert reporter._fragment("life_path", 1, locale="xx") == reporter.describe_life_path(1)
+
+def test_compose_caches_body_per_numeric_signature():
+    reporter.REPORT_CACHE.clear()
+    rules = SystemRules.load("pythagorean")
+    a = analyze(AnalysisInput(full_name="Nguyen Van A", date_of_birth="1990-01-23", target_year=2025), rules)["numbers"]
+    b = analyze(AnalysisInput(full_name="Nguyen Van A.", date_of_birth="1990-01-23", target_year=2025), rules)["numbers"]
+    r1 = reporter.compose(a, "Nguyen Van A", "1990-01-23")
+    hits = reporter.REPORT_CACHE.hits
+    r2 = reporter.compose(b, "Nguyen Van A.", "1990-01-23")
+    assert reporter.REPORT_CACHE.hits == hits + 1
+    assert r2["header"]["full_name"] == "Nguyen Van A." and r1["header"]["full_name"] == "Nguyen Van A"
+    assert r2["core"] == r1["core"] and list(r2) == list(r1)
+    r1["core"]["life_path"] = "changed"
+    r1["context"].append("changed")
+    r3 = reporter.compose(a, "Nguyen Van A", "1990-01-23")  # callers never share the cached report
+    assert r3["core"] == r2["core"] and r3["context"] == r2["context"] and r3["core"] is not r2["core"]
+    misses = reporter.REPORT_CACHE.misses
+    reporter.compose(a, "x", "y", role="pm")
+    reporter.compose(a, "x", "y", role="Product")  # same role after normalization
+    assert reporter.REPORT_CACHE.misses == misses + 1
+    c = dict(a, personal_year=a["personal_year"] % 9 + 1)
+    assert reporter.compose(c, "x", "y")["cycles"]["personal_year"] != r1["cycles"]["personal_year"]
+
+def test_compose_json_matches_encoded_compose():
+    rules = SystemRules.load("chaldean")
+    n = analyze(AnalysisInput(full_name="Trần Thị Thu Hà", date_of_birth="1985-12-31", target_year=2025), rules)["numbers"]
+    for role in (None, "teacher"):
+        expected = reporter.dumps_json(reporter.compose(n, "Trần Thị Thu Hà", "1985-12-31", system=rules.name, role=role))
+        assert reporter.compose_json(n, "Trần Thị Thu Hà", "1985-12-31", system=rules.name, role=role) == expected
+        assert json.loads(expected)["header"]["full_name"] == "Trần Thị Thu Hà"
+
+def test_expert_depths_add_compiled_pack_sections():
+    rules = SystemRules.load("pythagorean")
+    n = analyze(AnalysisInput(full_name="Nguyen Van An", date_of_birth="1990-05-17", target_year=2025), rules)["numbers"]
+    assert "expert" not in reporter.compose(n, "x", "y")
+    expert = reporter.compose(n, "x", "y", role="PM", depth="expert")
+    assert "years_detail" not in expert
+    block = expert["expert"]
+    assert block == packs.expert_pack().block(n["life_path"], n["expression"], n["personal_year"], "product_manager")
+    assert block["summary"].startswith(f"Số đường đời {n['life_path']} — ") and len(block["habits"]) <= 7
+    full = reporter.compose(n, "x", "y", depth="expert_max")
+    assert full["pinnacle_detail"]["number"] == n["pinnacles_detailed"][0]["number"]
+    assert full["years_detail"]["next"]["year"] == n["personal_year"] % 9 + 1
+
+def test_expert_profiles_merge_overlay_and_bridge():
+    pack = packs.expert_pack()
+    p = pack.profile(1, 7)
+    assert p is pack.profiles[(1, 7)] and p.if_then[-1].startswith("Bridge: ")
+    assert len(set(p.strengths)) == len(p.strengths)
+    assert set(pack.life_path[7]["strengths"]) <= set(p.strengths)
+    assert pack.profile(44, 1).theme == ""
+
+def test_invalid_expert_pack_is_rejected():
+    with pytest.raises(ValueError, match="bridge key"):
+        packs.ExpertPack("bad.json", {"life_path": {}, "bridges": {"seven": "x"}})
+    with pytest.raises(ValueError, match="bridges.1x7 must be a string"):
+        packs.ExpertPack("bad.json", {"life_path": {}, "bridges": {"1x7": 7}})
+
+def test_broken_pack_is_read_once_and_reported(tmp_path, monkeypatch):
+    (tmp_path / packs.EXPERT_PACKS[0]).write_text('{"life_path": {"1": {"theme": 1}}}', encoding="utf-8")
+    reads = []
+    real = packs._read
+    monkeypatch.setattr(packs, "CONTENT_DIR", str(tmp_path))
+    monkeypatch.setattr(packs, "_read", lambda name: reads.append(name) or real(name))
+    packs.expert_pack.cache_clear()
+    try:
+        for _ in range(3):
+            with pytest.raises(ValueError, match="theme must be a string"):
+                packs.expert_pack()
+        assert reads == [packs.EXPERT_PACKS[0]]
+        body = reporter._compose_body({"life_path": 1, "expression": 2}, None, "expert")
+        assert "theme must be a string" in body["expert_error"] and "expert" not in body
+    finally:
+        packs.expert_pack.cache_clear()
+
+def test_en_compose_returns_fresh_briefs():
+    n = {"life_path": 7, "expression": 7, "pinnacles_detailed": [{"index": 1, "number": 4}]}
+    a = en_reporter.compose(n, "A", "2000-01-01")
+    assert a["core"]["life_path"] == a["core"]["expression"] and a["core"]["life_path"] is not a["core"]["expression"]
+    a["core"]["life_path"]["summary"] = "changed"
+    assert en_reporter.compose(n, "A", "2000-01-01")["core"]["life_path"]["summary"] != "changed"
+    theme = reporter.enrich_pinnacles_detail(n["pinnacles_detailed"])[0]["theme"]
+    theme["advice"] = "changed"
+    assert reporter.FRAGMENTS["vi"]["pinnacle_detail"][4]["advice"] != "changed"
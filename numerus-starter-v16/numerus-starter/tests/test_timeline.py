@@ -0,0 +1,29 @@
+import pytest
+
+from numerus.engine import analyze, AnalysisInput
+from numerus.rules import SystemRules
+from numerus import timeline as tl
+
+def _active(detailed, age):
+    for stage in detailed:
+        if (stage["age_from"] is None or age >= stage["age_from"]) and (age < stage["age_to"] or stage["index"] == 4):
+            return stage
+
+@pytest.mark.parametrize("system", ["pythagorean", "chaldean"])
+def test_timeline_matches_per_year_analysis(system):
+    rules = SystemRules.load(system)
+    t = tl.timeline("1990-01-15", rules)
+    assert t["age"] == tuple(range(tl.MAX_AGE + 1)) and t["year"][0] == 1990
+    for age in t["age"]:
+        n = analyze(AnalysisInput(full_name="A", date_of_birth="1990-01-15", target_year=1990 + age), rules)["numbers"]
+        stage = _active(n["pinnacles_detailed"], age)
+        assert t["personal_year"][age] == n["personal_year"]
+        assert (t["pinnacle"][age], t["challenge"][age]) == (stage["number"], stage["challenge"])
+
+def test_timeline_cached_per_policy():
+    tl._timeline.cache_clear()
+    tl.timeline("2000-07-15", SystemRules.load("pythagorean"))
+    tl.timeline("2000-07-15", SystemRules.load("vietnamese_latin"))  # same reduction policy
+    assert tl.cache_stats()["hits"] == 1
+    with pytest.raises(ValueError):
+        tl.timeline("2000-02-30", SystemRules.load("pythagorean"))
@@ -0,0 +1,25 @@
+import pytest
+
+from numerus.engine import analyze, AnalysisInput
+from numerus.rules import SystemRules
+from numerus.variants import name_variants
+
+@pytest.mark.parametrize("system", ["pythagorean", "chaldean", "hebrew_gematria"])
+def test_variants_match_full_analysis(system):
+    rules = SystemRules.load(system)
+    res = name_variants("Nguyễn Văn Thành", {"Văn": ["", "Văn Minh"], "Thành": ["Tony", "Thanh"]}, rules,
+                        date_of_birth="1990-01-15")
+    assert [v["full_name"] for v in res["variants"]][:2] == ["Nguyễn Văn Thành", "Nguyễn Văn Tony"]
+    assert len(res["variants"]) == 9
+    for v in res["variants"]:
+        n = analyze(AnalysisInput(full_name=v["full_name"], date_of_birth="1990-01-15"), rules)["numbers"]
+        assert v == {"full_name": v["full_name"], **{k: n[k] for k in
+                     ("expression", "soul_urge", "personality", "karmic_lessons", "maturity")}}
+
+def test_variants_validation():
+    rules = SystemRules.load("pythagorean")
+    assert "maturity" not in name_variants("Mary Jane", {}, rules)["variants"][0]
+    with pytest.raises(ValueError):
+        name_variants("Mary Jane", {"Ann": ["Anne"]}, rules)
+    with pytest.raises(ValueError):
+        name_variants("Mary Jane", {}, rules, date_of_birth="1990-02-30")